@@ -0,0 +1,175 @@
+# Headless benchmark suite for BaseImageEditor: times each pipeline stage on synthetic images
+# and compares the results against a stored baseline. Runs without Tk or a display.
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from question1 import BaseImageEditor, ImageEditorApp
+
+DEFAULT_SIZES = "0.3,1,12,24"   # Megapixels; add 50,100 for the full sweep
+DEFAULT_KINDS = "8bit,16bit,alpha"
+DEFAULT_FORMATS = "jpg,png,tiff,webp"
+STAGES = ("load", "crop", "resize", "save", "display")
+
+# Formats that cannot store a given kind of image are skipped instead of silently converted
+UNSUPPORTED = {("16bit", "jpg"), ("16bit", "webp"), ("alpha", "jpg")}
+
+
+# Build a deterministic image with smooth gradients plus noise, so encoders do realistic work
+def make_synthetic_image(megapixels, kind, seed=0):
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    rng = np.random.default_rng(seed)
+    gradient = np.add.outer(np.linspace(0, 160, height), np.linspace(0, 80, width))
+    channels = 4 if kind == "alpha" else 3
+    image = np.empty((height, width, channels), dtype=np.float32)
+    for c in range(channels):
+        image[:, :, c] = gradient * (0.6 + 0.2 * c)
+    image += rng.normal(0, 8, size=(height, width, 1)).astype(np.float32)
+    image = np.clip(image, 0, 255)
+    if kind == "16bit":
+        return (image * 257).astype(np.uint16)
+    return image.astype(np.uint8)
+
+
+# Peak resident memory tracking: Linux can reset the high-water mark, elsewhere only the lifetime peak is known
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def peak_rss_bytes():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+# Time every stage of one case, keeping the median of several runs
+def run_case(source_path, output_path, repeat):
+    timings = {stage: [] for stage in STAGES}
+    reset_peak_rss()
+    for _ in range(repeat):
+        editor = BaseImageEditor()
+        editor.preserve_depth = True  # Otherwise 16-bit and alpha sources are decoded to 8-bit BGR
+        start = time.perf_counter()
+        editor.load_image(source_path)
+        timings["load"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        editor.crop_image()
+        timings["crop"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        editor.resize_image(50)
+        timings["resize"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        editor.save_image(output_path)
+        timings["save"].append(time.perf_counter() - start)
+
+        # The GUI's display conversion, minus the Tk PhotoImage which needs a display
+        start = time.perf_counter()
+        display, _ = ImageEditorApp.make_display_base(editor._image)
+        Image.fromarray(display)
+        timings["display"].append(time.perf_counter() - start)
+    return {stage: statistics.median(values) for stage, values in timings.items()}, peak_rss_bytes()
+
+
+# Run the whole size x kind x format matrix and return flat results keyed by case and stage
+def run_benchmarks(sizes, kinds, formats, repeat, work_dir):
+    results = {}
+    for megapixels in sizes:
+        for kind in kinds:
+            image = make_synthetic_image(megapixels, kind)
+            pixels = image.shape[0] * image.shape[1]
+            for fmt in formats:
+                if (kind, fmt) in UNSUPPORTED:
+                    continue
+                case = f"{megapixels}MP-{kind}-{fmt}"
+                source_path = os.path.join(work_dir, f"source.{fmt}")
+                output_path = os.path.join(work_dir, f"output.{fmt}")
+                if not cv2.imwrite(source_path, image):
+                    print(f"{case}: encoder unavailable, skipped", file=sys.stderr)
+                    continue
+                timings, peak = run_case(source_path, output_path, repeat)
+                for stage, seconds in timings.items():
+                    results[f"{case}-{stage}"] = {
+                        "seconds": seconds,
+                        "megapixels_per_second": pixels / 1e6 / seconds if seconds > 0 else None,
+                        "peak_rss_bytes": peak,
+                    }
+                print(f"{case:<24}" + "  ".join(f"{stage} {timings[stage] * 1000:8.1f}ms" for stage in STAGES)
+                      + f"  peak {peak / 2 ** 20:8.1f} MB")
+                os.remove(source_path)
+    return results
+
+
+# Compare against a baseline; a stage regresses when it is slower by more than threshold (0.2 = 20%)
+# and by more than min_seconds, so sub-millisecond stages do not fail on timer noise
+def find_regressions(results, baseline, threshold, min_seconds=0.001):
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if (previous and result["seconds"] > previous["seconds"] * (1 + threshold)
+                and result["seconds"] - previous["seconds"] > min_seconds):
+            regressions.append((key, previous["seconds"], result["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BaseImageEditor stages on synthetic images")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated megapixel sizes")
+    parser.add_argument("--kinds", default=DEFAULT_KINDS, help="comma-separated kinds: 8bit, 16bit, alpha")
+    parser.add_argument("--formats", default=DEFAULT_FORMATS, help="comma-separated formats: jpg, png, tiff, webp")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the median is reported")
+    parser.add_argument("--baseline", default="bench_baseline.json", help="baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing")
+    parser.add_argument("--min-seconds", type=float, default=0.001, help="ignore slowdowns smaller than this")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [float(v) for v in args.sizes.split(",")]
+    with tempfile.TemporaryDirectory() as work_dir:
+        results = run_benchmarks(sizes, args.kinds.split(","), args.formats.split(","), args.repeat, work_dir)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.threshold, args.min_seconds)
+    for key, before, after in regressions:
+        print(f"REGRESSION {key}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms", file=sys.stderr)
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
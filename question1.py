@@ -1,59 +1,1501 @@
+import argparse
+import contextlib
+import csv
+import functools
+import hashlib
+import json
+import os
+import queue
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
 import cv2
-import customtkinter
-from tkinter import Tk, Label, Button, filedialog, Frame
-from PIL import Image, ImageTk
+import numpy as np
+from PIL import Image
+
+# The GUI toolkit is optional so batch mode and benchmarks run on display-less machines without Tk
+try:
+    import customtkinter
+    from tkinter import Tk, Label, Button, Canvas, filedialog, simpledialog, Frame
+    from PIL import ImageTk
+except ImportError:
+    customtkinter = None
+
+# Rolling latency statistics per named stage, over the last window samples of each
+class StageProfiler:
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = {}  # Stage -> deque of seconds; appends are safe from worker threads
+
+    def record(self, stage, seconds):
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    @contextlib.contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    # Count, mean, p50/p95/p99 and max in milliseconds for every stage seen so far
+    def summary(self):
+        stats = {}
+        for stage, samples in list(self._samples.items()):
+            values = np.array(samples) * 1000
+            if values.size:
+                p50, p95, p99 = np.percentile(values, (50, 95, 99))
+                stats[stage] = {"count": int(values.size), "mean_ms": float(values.mean()), "p50_ms": float(p50),
+                                "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(values.max())}
+        return stats
+
+    # Write the summary as JSON, or as CSV when path ends in .csv
+    def export(self, path):
+        stats = self.summary()
+        with open(path, "w", newline="") as f:
+            if path.lower().endswith(".csv"):
+                writer = csv.writer(f)
+                writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for stage, row in sorted(stats.items()):
+                    writer.writerow([stage] + [round(v, 4) if isinstance(v, float) else v for v in row.values()])
+            else:
+                json.dump({"window": self.window, "stages": stats}, f, indent=2)
+
+    def clear(self):
+        self._samples.clear()
+
+
+# Time a method into self.profiler under stage, default the method's name, when profiling is enabled
+def profiled(stage=None):
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.time(stage or method.__name__):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Record the peak NumPy/Python allocation of an editor operation in memory_stats when track_memory is set
+def tracks_peak_memory(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.track_memory:
+            return method(self, *args, **kwargs)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.memory_stats[method.__name__] = tracemalloc.get_traced_memory()[1] - baseline
+            if started_tracing:
+                tracemalloc.stop()
+    return wrapper
+
+
+# Reusable output buffers for cv2.resize so repeated resizes of the same size do not reallocate
+class ResizeBufferPool:
+    def __init__(self, slots=2):
+        self.slots = slots
+        self._key = None
+        self._buffers = []
+        self._next = 0
+
+    # Hand out the next buffer for this shape, cycling through the slots
+    def acquire(self, shape, dtype):
+        key = (tuple(shape), np.dtype(dtype))
+        if key != self._key:
+            # Only the most recent output size is kept so the pool never grows with slider positions
+            self._key, self._buffers, self._next = key, [], 0
+        if len(self._buffers) < self.slots:
+            buffer = np.empty(key[0], dtype=key[1])
+            self._buffers.append(buffer)
+            return buffer
+        buffer = self._buffers[self._next]
+        self._next = (self._next + 1) % len(self._buffers)
+        return buffer
+
+
+# Very large scans are opened on purpose, so lift Pillow's decompression-bomb limit for header reads
+Image.MAX_IMAGE_PIXELS = None
+
+# Raw pixel layouts that can be memory-mapped straight from the file, mapped to (bytes per pixel, channel order)
+MAPPABLE_RAWMODES = {"BGR": (3, "BGR"), "RGB": (3, "RGB"), "BGRX": (4, "BGR"), "RGBX": (4, "RGB"), "L": (1, "L")}
+
+
+# cv2.imread flags that keep bit depth and alpha. JPEG is always 8-bit colour, and the default
+# decode keeps its EXIF rotation, which IMREAD_UNCHANGED would ignore.
+def preserving_imread_flags(path):
+    try:
+        with Image.open(path) as header:
+            if header.format == "JPEG":
+                return cv2.IMREAD_COLOR
+    except Exception:
+        pass
+    return cv2.IMREAD_UNCHANGED
+
+
+# EXIF orientations 5-8 turn the image a quarter turn, so the decoded image swaps width and height
+EXIF_ORIENTATION_TAG = 0x0112
+TRANSPOSING_ORIENTATIONS = (5, 6, 7, 8)
+
+
+# (width, height) of the image cv2.imread will return for this header with the given flags. Every
+# decode except IMREAD_UNCHANGED applies the EXIF orientation, which the header size ignores.
+def decoded_size(header, flags):
+    width, height = header.size
+    if flags != cv2.IMREAD_UNCHANGED and header.getexif().get(EXIF_ORIENTATION_TAG, 1) in TRANSPOSING_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+# An image opened as a reduced-resolution proxy, with full-resolution pixels read lazily per region.
+# With preserve_depth the proxy and regions keep the file's sample type and channels.
+class LazyImageSource:
+    def __init__(self, path, proxy_size=(1000, 1000), preserve_depth=False):
+        self.path = path
+        self._pixels = None  # Memory-mapped full-resolution pixels when the file layout allows it
+        self._channel_order = "BGR"
+        self.preserve_depth = preserve_depth
+        self._imread_flags = preserving_imread_flags(path) if preserve_depth else cv2.IMREAD_COLOR
+        if path.lower().endswith(".npy"):
+            self._pixels = np.load(path, mmap_mode="r")
+            height, width = self._pixels.shape[:2]
+        else:
+            with Image.open(path) as header:
+                width, height = header.size
+                mapped = self._map_raw_pixels(path, width, height, list(header.tile))
+                if mapped is None:
+                    # Decoded proxies and regions come out rotated; mapped pixels are used as stored
+                    width, height = decoded_size(header, self._imread_flags)
+            if mapped is not None:
+                self._pixels, self._channel_order = mapped
+        self.shape = (height, width)
+
+        # Largest power-of-two reduction that still keeps the proxy at least proxy_size on its long side
+        self.factor = 1
+        while self.factor < 8 and max(width / proxy_size[0], height / proxy_size[1]) >= self.factor * 2:
+            self.factor *= 2
+
+        if self._pixels is not None:
+            self.proxy = self._to_pixels(self._pixels[::self.factor, ::self.factor])
+        elif self._imread_flags == cv2.IMREAD_UNCHANGED:
+            # Reduced decoding is 8-bit colour only, so high-depth files are decoded whole and area-reduced
+            self.proxy = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if self.proxy is not None and self.factor > 1:
+                self.proxy = cv2.resize(self.proxy, (width // self.factor, height // self.factor),
+                                        interpolation=cv2.INTER_AREA)
+        else:
+            # JPEG decodes straight at 1/2, 1/4 or 1/8 size through DCT scaling
+            flags = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2,
+                     4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+            self.proxy = cv2.imread(path, flags[self.factor])
+        if self.proxy is None:
+            raise ValueError("Failed to load image.")
+
+    # Memory-map uncompressed single-plane layouts (BMP, PPM/PGM, raw TIFF strips) without decoding
+    @staticmethod
+    def _map_raw_pixels(path, width, height, tiles):
+        if not tiles or any(tile[0] != "raw" for tile in tiles):
+            return None
+        args = [tile[3] if isinstance(tile[3], tuple) else (tile[3], 0, 1) for tile in tiles]
+        rawmode, stride, orientation = (tuple(args[0]) + (0, 1))[:3]
+        if rawmode not in MAPPABLE_RAWMODES or any(tuple(a) != tuple(args[0]) for a in args):
+            return None
+        channels = MAPPABLE_RAWMODES[rawmode][0]
+        stride = stride or width * channels
+
+        # Multiple strips are only mappable when they are stored back to back
+        tiles = sorted(tiles, key=lambda tile: tile[2])
+        expected = tiles[0][2]
+        for tile in tiles:
+            x0, y0, x1, y1 = tile[1]
+            if tile[2] != expected or x0 != 0 or x1 != width:
+                return None
+            expected += (y1 - y0) * stride
+
+        rows = np.memmap(path, dtype=np.uint8, mode="r", offset=tiles[0][2], shape=(height, stride))
+        if orientation == -1:
+            rows = rows[::-1]  # Bottom-up files such as BMP
+        pixels = rows[:, :width * channels].reshape(height, width, channels)
+        return (pixels[:, :, :3] if channels == 4 else pixels), MAPPABLE_RAWMODES[rawmode][1]
+
+    # Convert a slice of the mapped pixels to a contiguous array, copying only that slice. Colour is
+    # reordered to BGR; grey stays 2-D with preserve_depth, as a decoded PNG would, else becomes BGR
+    def _to_pixels(self, pixels):
+        if pixels.ndim == 3 and pixels.shape[2] == 1:
+            pixels = pixels[:, :, 0]
+        if pixels.ndim == 2:
+            if self.preserve_depth:
+                return np.ascontiguousarray(pixels)
+            return cv2.cvtColor(np.ascontiguousarray(pixels), cv2.COLOR_GRAY2BGR)
+        if self._channel_order == "RGB":
+            return np.ascontiguousarray(pixels[:, :, ::-1])
+        return np.ascontiguousarray(pixels)
+
+    # Whether regions can be read without decoding the whole file
+    @property
+    def is_mapped(self):
+        return self._pixels is not None
+
+    # Full-resolution pixels for a rectangle given in full-resolution coordinates
+    def read_region(self, x1, y1, x2, y2):
+        if self._pixels is not None:
+            return self._to_pixels(self._pixels[y1:y2, x1:x2])
+        if self.factor == 1:
+            return self.proxy[y1:y2, x1:x2]
+        # Compressed formats other than JPEG scaling cannot be decoded by region: decode, slice, release
+        image = cv2.imread(self.path, self._imread_flags)
+        if image is None:
+            raise ValueError("Failed to load full-resolution image.")
+        return image[y1:y2, x1:x2].copy()
+
+    # Map a rectangle in proxy coordinates to full-resolution coordinates
+    def to_full_resolution(self, rectangle):
+        proxy_h, proxy_w = self.proxy.shape[:2]
+        full_h, full_w = self.shape
+        x1, y1, x2, y2 = rectangle
+        return [min(full_w, round(x1 * full_w / proxy_w)), min(full_h, round(y1 * full_h / proxy_h)),
+                min(full_w, round(x2 * full_w / proxy_w)), min(full_h, round(y2 * full_h / proxy_h))]
+
+
+# Tiled crop-and-resize for images larger than memory: the crop is streamed tile by tile
+# and the output is written straight into a memory-mapped file
+STREAMABLE_EXTENSIONS = (".ppm", ".bmp", ".npy")
+
+# Extra source pixels each tile needs around it for the interpolation kernel
+INTERPOLATION_SUPPORT = {cv2.INTER_NEAREST: 1, cv2.INTER_LINEAR: 1, cv2.INTER_CUBIC: 2, cv2.INTER_LANCZOS4: 4}
+
+
+# Create an output file of the given size and return a writable (height, width, 3) BGR view of it
+def open_streamed_output(path, width, height):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(height, width, 3))
+    if extension == ".ppm":
+        header = f"P6\n{width} {height}\n255\n".encode("ascii")
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(len(header) + width * height * 3)
+        pixels = np.memmap(path, dtype=np.uint8, mode="r+", offset=len(header), shape=(height, width, 3))
+        return pixels[:, :, ::-1]  # PPM stores RGB
+    if extension == ".bmp":
+        stride = (width * 3 + 3) & ~3
+        size = 54 + stride * height
+        header = (b"BM" + size.to_bytes(4, "little") + bytes(4) + (54).to_bytes(4, "little")
+                  + (40).to_bytes(4, "little") + width.to_bytes(4, "little") + height.to_bytes(4, "little")
+                  + (1).to_bytes(2, "little") + (24).to_bytes(2, "little") + bytes(24))
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(size)
+        rows = np.memmap(path, dtype=np.uint8, mode="r+", offset=54, shape=(height, stride))
+        return rows[::-1, :width * 3].reshape(height, width, 3)  # BMP rows are stored bottom-up
+    raise ValueError(f"Tiled output must be one of {', '.join(STREAMABLE_EXTENSIONS)}, got: {path}")
+
+
+# Pick the largest output tile (full rows first) whose source window and output fit the byte budget
+def plan_tiles(out_w, out_h, inv_x, inv_y, pad, budget, channels=3):
+    tile_w, tile_h = out_w, out_h
+    while True:
+        source_bytes = (tile_w * inv_x + 2 * pad + 1) * (tile_h * inv_y + 2 * pad + 1) * channels
+        cost = 2 * source_bytes + tile_w * tile_h * channels  # Source window, its prefiltered copy, output
+        if cost <= budget or (tile_w <= 16 and tile_h <= 16):
+            return tile_w, tile_h
+        if tile_h > 16:
+            tile_h = max(16, tile_h // 2)
+        else:
+            tile_w = max(16, tile_w // 2)
+
+
+# Crop rectangle (full-resolution coordinates) out of source, scale it and stream it to output_path
+def tiled_crop_resize(source, rectangle, scale, output_path, tile_budget, interpolation=cv2.INTER_AREA):
+    x1, y1, x2, y2 = rectangle
+    crop_w, crop_h = x2 - x1, y2 - y1
+    out_w, out_h = int(crop_w * scale / 100), int(crop_h * scale / 100)
+    if out_w < 1 or out_h < 1:
+        raise ValueError("Scale is too small to resize.")
+    inv_x, inv_y = crop_w / out_w, crop_h / out_h  # Same source/destination ratio cv2.resize uses
+
+    # Whole-factor area downscales are exact on aligned blocks; anything else is resampled with an
+    # affine warp, after a box prefilter when shrinking, so every tile matches a single full resize
+    exact_area = (interpolation == cv2.INTER_AREA and inv_x == int(inv_x) and inv_y == int(inv_y))
+    shrinking = inv_x > 1 or inv_y > 1
+    if interpolation == cv2.INTER_AREA:
+        interpolation = cv2.INTER_LINEAR
+    box = (max(1, round(inv_x)), max(1, round(inv_y))) if shrinking and not exact_area else (1, 1)
+    pad = 0 if exact_area else INTERPOLATION_SUPPORT.get(interpolation, 4) + max(box) // 2 + 1
+
+    # Compressed sources cannot be read by region, so hold the decoded crop once instead of per tile
+    if not source.is_mapped:
+        crop = source.read_region(x1, y1, x2, y2)
+        read = lambda bx0, by0, bx1, by1: crop[by0:by1, bx0:bx1]
+    else:
+        read = lambda bx0, by0, bx1, by1: source.read_region(x1 + bx0, y1 + by0, x1 + bx1, y1 + by1)
+
+    output = open_streamed_output(output_path, out_w, out_h)
+    tile_w, tile_h = plan_tiles(out_w, out_h, inv_x, inv_y, pad, tile_budget)
+    for ty in range(0, out_h, tile_h):
+        th = min(tile_h, out_h - ty)
+        for tx in range(0, out_w, tile_w):
+            tw = min(tile_w, out_w - tx)
+            if exact_area:
+                block = read(int(tx * inv_x), int(ty * inv_y), int((tx + tw) * inv_x), int((ty + th) * inv_y))
+                output[ty:ty + th, tx:tx + tw] = cv2.resize(block, (tw, th), interpolation=cv2.INTER_AREA)
+                continue
+
+            # Source window covering this tile plus the kernel overlap, clamped to the crop
+            bx0 = max(0, int((tx + 0.5) * inv_x - 0.5) - pad)
+            by0 = max(0, int((ty + 0.5) * inv_y - 0.5) - pad)
+            bx1 = min(crop_w, int((tx + tw + 0.5) * inv_x - 0.5) + pad + 2)
+            by1 = min(crop_h, int((ty + th + 0.5) * inv_y - 0.5) + pad + 2)
+            window = read(bx0, by0, bx1, by1)
+            if box != (1, 1):
+                window = cv2.blur(window, box, borderType=cv2.BORDER_REPLICATE)
+
+            # Map tile pixels back to window pixels: src = (dst + 0.5) * inv - 0.5
+            transform = np.array([[inv_x, 0, (tx + 0.5) * inv_x - 0.5 - bx0],
+                                  [0, inv_y, (ty + 0.5) * inv_y - 0.5 - by0]], dtype=np.float64)
+            output[ty:ty + th, tx:tx + tw] = cv2.warpAffine(
+                window, transform, (tw, th), flags=interpolation | cv2.WARP_INVERSE_MAP,
+                borderMode=cv2.BORDER_REPLICATE)
+    output.flush()
+
+
+# Friendly encoder settings accepted per format, mapped to OpenCV imwrite flags
+ENCODER_PARAMS = {
+    "jpg": {"quality": cv2.IMWRITE_JPEG_QUALITY, "progressive": cv2.IMWRITE_JPEG_PROGRESSIVE,
+            "optimize": cv2.IMWRITE_JPEG_OPTIMIZE},
+    "png": {"compression": cv2.IMWRITE_PNG_COMPRESSION, "strategy": cv2.IMWRITE_PNG_STRATEGY},
+    "webp": {"quality": cv2.IMWRITE_WEBP_QUALITY},
+    "tiff": {"compression": cv2.IMWRITE_TIFF_COMPRESSION},
+}
+FORMAT_ALIASES = {"jpeg": "jpg", "tif": "tiff"}
+
+
+# Normalise a format name or file extension, e.g. ".JPEG" -> "jpg"
+def normalise_format(name):
+    name = name.lower().lstrip(".")
+    return FORMAT_ALIASES.get(name, name)
+
+
+# Turn {"quality": 85, "progressive": 1} into the flat flag/value list cv2.imwrite expects
+def encoder_params(fmt, params):
+    known = ENCODER_PARAMS.get(normalise_format(fmt), {})
+    flags = []
+    for name, value in (params or {}).items():
+        if name not in known:
+            raise ValueError(f"Unknown {fmt} encoder setting: {name}")
+        flags += [known[name], int(value)]
+    return flags
+
+
+# Sample types and channel counts each encoder stores as-is; anything else would be silently converted
+ENCODER_DEPTHS = {
+    "jpg": ((np.uint8,), (1, 3)),
+    "webp": ((np.uint8,), (3, 4)),
+    "bmp": ((np.uint8,), (1, 3, 4)),
+    "png": ((np.uint8, np.uint16), (1, 3, 4)),
+    "tiff": ((np.uint8, np.uint16, np.float32), (1, 3, 4)),
+}
+
+
+# Reject writing an image to a format that cannot store its bit depth or channels
+def check_encodable(fmt, image):
+    fmt = normalise_format(fmt)
+    if fmt not in ENCODER_DEPTHS:
+        return
+    dtypes, channel_counts = ENCODER_DEPTHS[fmt]
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    if image.dtype not in dtypes:
+        usable = [name.upper() for name, (types, _) in ENCODER_DEPTHS.items() if image.dtype in types]
+        raise ValueError(f"{fmt.upper()} cannot store {image.dtype} images; use {' or '.join(usable) or 'NPY'}")
+    if channels not in channel_counts:
+        usable = [name.upper() for name, (types, counts) in ENCODER_DEPTHS.items()
+                  if image.dtype in types and channels in counts]
+        raise ValueError(f"{fmt.upper()} cannot store {channels}-channel images; use {' or '.join(usable)}")
+
+
+# One output of export_image: destination, encoder and settings, and the scale to render at
+class ExportTarget:
+    def __init__(self, path, scale=100, params=None, fmt=None):
+        self.path = path
+        self.scale = scale
+        self.params = params or {}
+        self.format = normalise_format(fmt or os.path.splitext(path)[1])
+
+
+# Least-recently-used cache of rendered results, bounded by total bytes rather than entry count
+class LRURenderCache:
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._bytes = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+
+# Content hash of a source file, so cached renders follow the pixels rather than the path
+def source_digest(path, chunk_size=2 ** 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Content-addressed cache of rendered arrays: an in-memory LRU tier in front of an optional on-disk
+# tier of .npy files, each bounded by total bytes. Cached arrays are read-only and shared by every hit.
+# The disk tier may be shared by several processes (batch workers), so it keeps no in-process index:
+# lookups go to the file system. Its size is tracked as a running estimate of the directory plus this
+# process's writes, re-measured from the directory's actual contents whenever the estimate passes
+# disk_max_bytes, or after DISK_RESCAN_WRITES writes or 1/DISK_RESCAN_FRACTION of the bound written.
+# Processes sharing a directory therefore share one bound, overshooting it by at most about
+# 1/DISK_RESCAN_FRACTION of it per process, while a write costs amortised O(1) directory scans.
+DISK_RESCAN_WRITES = 64
+DISK_RESCAN_FRACTION = 16
+
+class RenderCache:
+    def __init__(self, max_bytes=256 * 2 ** 20, disk_dir=None, disk_max_bytes=2 ** 30):
+        self.memory = LRURenderCache(max_bytes)
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.hits = self.disk_hits = self.misses = 0
+        self._disk_bytes = 0
+        self._writes_since_scan = self._bytes_since_scan = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    @staticmethod
+    def _file_name(key):
+        return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest() + ".npy"
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        if self.disk_dir:
+            value = self._read_disk(self._file_name(key))
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.put(key, value, value.nbytes)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        value.flags.writeable = False
+        self.memory.put(key, value, value.nbytes)
+        if self.disk_dir:
+            self._write_disk(self._file_name(key), value)
+
+    # Disk entries are best effort: missing, unreadable or concurrently evicted files are treated as misses
+    def _read_disk(self, name):
+        path = os.path.join(self.disk_dir, name)
+        try:
+            value = np.load(path)
+            os.utime(path)  # Refresh the modification time, which orders eviction
+        except (OSError, ValueError):
+            return None
+        value.flags.writeable = False
+        return value
+
+    # Files are written under a unique temporary name and renamed into place, so other processes
+    # never load a partial entry and concurrent writers of the same key cannot collide
+    def _write_disk(self, name, value):
+        path = os.path.join(self.disk_dir, name)
+        if value.nbytes > self.disk_max_bytes or os.path.exists(path):
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.disk_dir)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, value)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError:
+            if temp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+            return
+        self._disk_bytes += size
+        self._bytes_since_scan += size
+        self._writes_since_scan += 1
+        if (self._disk_bytes > self.disk_max_bytes or self._writes_since_scan >= DISK_RESCAN_WRITES
+                or self._bytes_since_scan * DISK_RESCAN_FRACTION >= self.disk_max_bytes):
+            self._evict_disk()
+
+    # Cache files in the directory as (modification time, bytes, path), least recently used first
+    def _disk_entries(self):
+        entries = []
+        try:
+            with os.scandir(self.disk_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".npy"):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue  # Evicted by another process since the listing
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return []
+        return sorted(entries)
+
+    # Remove the oldest files until the directory fits disk_max_bytes. A file another process has
+    # already removed still counts as evicted, so concurrent evictions do not overshoot.
+    def _evict_disk(self):
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.disk_max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= size
+        self._disk_bytes, self._writes_since_scan, self._bytes_since_scan = total, 0, 0
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_bytes": self.memory.nbytes, "disk_bytes": self._disk_bytes}
+
+    # Drop the in-memory tier; the disk tier is kept for later sessions
+    def clear(self):
+        self.memory.clear()
+
+
+# Auto-crop: saliency is computed on a small proxy and the best window found with an integral image
+AUTO_CROP_PROXY_SIDE = 256
+
+# Edge energy plus centre-surround contrast of an image of any depth, as float32 normalised to sum 1
+def saliency_map(image, max_side=AUTO_CROP_PROXY_SIDE):
+    # Strided sampling down to about twice the proxy size first: area-averaging a whole large image is far slower
+    step = max(1, max(image.shape[:2]) // (max_side * 2))
+    image = image[::step, ::step]
+    h, w = image.shape[:2]
+    fit = min(max_side / max(h, w), 1.0)
+    small = cv2.resize(image, (max(1, round(w * fit)), max(1, round(h * fit))), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = small[:, :, :3] if small.shape[2] == 4 else small
+        gray = cv2.cvtColor(small.astype(np.float32), cv2.COLOR_BGR2GRAY)
+    else:
+        gray = small.astype(np.float32)
+    gray = cv2.normalize(gray, None, 0, 1, cv2.NORM_MINMAX)
+    edges = cv2.magnitude(cv2.Sobel(gray, cv2.CV_32F, 1, 0), cv2.Sobel(gray, cv2.CV_32F, 0, 1))
+    contrast = np.abs(gray - cv2.GaussianBlur(gray, (0, 0), max(gray.shape) / 8))
+    energy = cv2.GaussianBlur(edges / (edges.max() + 1e-6) + contrast / (contrast.max() + 1e-6), (0, 0), 2)
+    return energy / (energy.sum() + 1e-6)
+
+# Best crop rectangle of the given aspect (width / height, default the image's own) holding the most saliency.
+# size is the crop's side as a fraction of the largest rectangle of that aspect that fits the image.
+def suggest_crop(image, aspect=None, size=1.0):
+    h, w = image.shape[:2]
+    aspect = aspect or w / h
+    crop_w, crop_h = (w, w / aspect) if w / aspect <= h else (h * aspect, h)
+    crop_w, crop_h = max(1, min(w, round(crop_w * size))), max(1, min(h, round(crop_h * size)))
+
+    # Sum of saliency inside every window position at once, from four shifted views of the integral image
+    energy = saliency_map(image)
+    ratio_x, ratio_y = w / energy.shape[1], h / energy.shape[0]
+    box_w = max(1, min(energy.shape[1], round(crop_w / ratio_x)))
+    box_h = max(1, min(energy.shape[0], round(crop_h / ratio_y)))
+    integral = cv2.integral(energy)
+    sums = (integral[box_h:, box_w:] - integral[:-box_h, box_w:]
+            - integral[box_h:, :-box_w] + integral[:-box_h, :-box_w])
+    y, x = np.unravel_index(np.argmax(sums), sums.shape)
+
+    x1 = min(w - crop_w, round(x * ratio_x))
+    y1 = min(h - crop_h, round(y * ratio_y))
+    return [x1, y1, x1 + crop_w, y1 + crop_h]
+
+# Parse an auto-crop spec of the form "aspect[@size]", aspect as "16:9", "1.5" or "image", e.g. "1:1@0.8"
+def parse_auto_crop_spec(spec):
+    aspect, _, size = spec.partition("@")
+    if aspect == "image":
+        ratio = None
+    else:
+        width, _, height = aspect.partition(":")
+        width, height = float(width), float(height or 1)
+        # Both terms are checked before dividing: argparse only reports ValueError as a usage error
+        if not (0 < width < np.inf and 0 < height < np.inf):
+            raise ValueError(f"Auto-crop aspect terms must be greater than zero, got: {spec}")
+        ratio = width / height
+    size = float(size) if size else 1.0
+    if not 0 < size <= 1:
+        raise ValueError(f"Auto-crop spec must be aspect[@size] with size in (0, 1], got: {spec}")
+    return ratio, size
+
 
 class BaseImageEditor:
     def __init__(self):
         self._image = None
-        self._cropped_image = None
-        self._resized_image = None
+        self._cropped_image = None  # Always a view into _image, never a copy
+        self._resized_image = None  # A view of the crop at 100%, otherwise a reused pool buffer
         self._crop_rectangle = None
+        self._resize_buffers = ResizeBufferPool()
+
+        # Reduced-resolution loading: _image is then a proxy and full-resolution pixels are read at save time
+        self._source = None  # LazyImageSource when loaded with a proxy size
+        self._source_path = None
+        self._source_key = None
+        self._scale = 100  # Scale of the current result, so it can be re-rendered at full resolution
+        self.tile_budget = 256 * 2 ** 20  # Bytes of pixel data a full-resolution save may hold at once
+
+        # Peak memory per operation, filled in when track_memory is enabled
+        self.track_memory = False
+        self.memory_stats = {}
+
+        # Interpolation used for final-quality resizes
+        self.downscale_interpolation = cv2.INTER_AREA
+        self.upscale_interpolation = cv2.INTER_CUBIC  # cv2.INTER_LANCZOS4 for the sharpest enlargements
+
+        # Keep 16-bit/float samples and alpha instead of decoding everything to 8-bit BGR
+        self.preserve_depth = False
+
+        # Optional StageProfiler collecting per-stage latencies
+        self.profiler = None
+
+        # Optional RenderCache; when set, resize_image results are cached and returned read-only
+        self.render_cache = None
 
     # Selecting and loading the preferred image from the local device
-    def load_image(self, path):
+    # With proxy_size, a reduced-resolution proxy is decoded instead and crop coordinates refer to it
+    @profiled("load")
+    @tracks_peak_memory
+    def load_image(self, path, proxy_size=None):
         try:
-            self._image = cv2.imread(path)
+            if proxy_size is None:
+                self._source = None
+                flags = preserving_imread_flags(path) if self.preserve_depth else cv2.IMREAD_COLOR
+                self._image = cv2.imread(path, flags)
+            else:
+                self._source = LazyImageSource(path, proxy_size, self.preserve_depth)
+                self._image = self._source.proxy
             if self._image is None:
                 raise ValueError("Failed to load image.")
+            self._source_path, self._source_key = path, None
             h, w = self._image.shape[:2]
             crop_w, crop_h = w // 2, h // 2
             x1, y1 = (w - crop_w) // 2, (h - crop_h) // 2
             self._crop_rectangle = [x1, y1, x1 + crop_w, y1 + crop_h]
         except Exception as e:
             raise IOError(f"Error loading image: {e}")
+
+    # Setting the crop rectangle explicitly, clamped to the loaded image bounds
+    def set_crop_rectangle(self, rectangle):
+        if self._image is None:
+            raise ValueError("No image loaded.")
+        h, w = self._image.shape[:2]
+        x1, y1, x2, y2 = [int(v) for v in rectangle]
+        x1, x2 = max(0, min(x1, w)), max(0, min(x2, w))
+        y1, y2 = max(0, min(y1, h)), max(0, min(y2, h))
+        if x2 <= x1 or y2 <= y1:
+            raise ValueError(f"Invalid crop rectangle: {list(rectangle)}")
+        self._crop_rectangle = [x1, y1, x2, y2]
         
     ''' Cropping the image by drawing a rectangle
         Displaying the Cropped image
+        The crop is a NumPy view, so no pixels are copied
     '''
+    @profiled("crop")
+    @tracks_peak_memory
     def crop_image(self):
         if self._image is None or self._crop_rectangle is None:
             return None
         x1, y1, x2, y2 = self._crop_rectangle
         self._cropped_image = self._image[y1:y2, x1:x2]
-        self._resized_image = self._cropped_image.copy()
+        self._resized_image = self._cropped_image
+        self._scale = 100
         return self._cropped_image
+
+    # Move the crop rectangle to the most salient region, see suggest_crop
+    @profiled("auto_crop")
+    def auto_crop(self, aspect=None, size=1.0):
+        if self._image is None:
+            raise ValueError("No image loaded.")
+        self._crop_rectangle = suggest_crop(self._image, aspect, size)
+        return self._crop_rectangle
+
+    # Whether _image is a reduced proxy of a larger source
+    @property
+    def is_reduced(self):
+        return self._source is not None and self._source.factor > 1
+
+    # The crop rectangle in full-resolution source coordinates
+    def full_resolution_rectangle(self):
+        if self.is_reduced:
+            return self._source.to_full_resolution(self._crop_rectangle)
+        return list(self._crop_rectangle)
+
+    # Width and height the saved output will have at the given scale
+    def output_size(self, scale):
+        x1, y1, x2, y2 = self.full_resolution_rectangle()
+        return int((x2 - x1) * scale / 100), int((y2 - y1) * scale / 100)
+
+    # Context manager timing a block into the profiler; does nothing when profiling is off
+    def timed(self, stage):
+        return self.profiler.time(stage) if self.profiler is not None else contextlib.nullcontext()
+
+    # Identifies the loaded pixels for the render cache: the file's content hash and the decoded shape
+    # and sample type, which differ between a proxy, a full decode and a depth-preserving one. Hashed on first use.
+    @property
+    def source_key(self):
+        if self._source_key is None and self._source_path is not None:
+            self._source_key = (source_digest(self._source_path), self._image.shape, str(self._image.dtype))
+        return self._source_key
+
+    # Render cache key for the current crop rendered at scale with interpolation into an image of size
+    def render_key(self, scale, interpolation, size):
+        return self.source_key, tuple(self._crop_rectangle), float(scale), int(interpolation), tuple(size)
+
+    # The crop at full resolution, decoding only the cropped region of a reduced source
+    def full_resolution_crop(self):
+        if self.is_reduced:
+            return self._source.read_region(*self.full_resolution_rectangle())
+        return self._cropped_image
+
+    # The current result at full resolution, decoding only the cropped region of a reduced source
+    def full_resolution_result(self, scale=None, interpolation=None):
+        if not self.is_reduced:
+            return self._resized_image
+        scale = self._scale if scale is None else scale
+        if interpolation is None:
+            interpolation = self.quality_interpolation(scale)
+        return self.scale_image(self.full_resolution_crop(), scale, interpolation)
     
     # Resizing the cropped image by a given scale percentage
 
-    def resize_image(self, scale):
+    # The result lives in a reused buffer and is overwritten by a later resize: copy it to keep it.
+    # With a render cache the result is instead a read-only array owned by the cache.
+    @profiled("resize")
+    @tracks_peak_memory
+    def resize_image(self, scale, interpolation=None):
         if self._cropped_image is None:
             return None
-        width = int(self._cropped_image.shape[1] * scale / 100)
-        height = int(self._cropped_image.shape[0] * scale / 100)
-        self._resized_image = cv2.resize(self._cropped_image, (width, height))
+        if interpolation is None:
+            interpolation = self.quality_interpolation(scale)
+        if self.render_cache is not None:
+            key = self.render_key(scale, interpolation, self.scaled_size(self._cropped_image, scale))
+            resized = self.render_cache.get(key)
+            if resized is None:
+                resized = self.scale_image(self._cropped_image, scale, interpolation)
+                self.render_cache.put(key, resized)
+            self._resized_image = resized
+        else:
+            dst = self.acquire_resize_buffer(self._cropped_image, scale)
+            self._resized_image = self.scale_image(self._cropped_image, scale, interpolation, dst)
+        self._scale = scale
         return self._resized_image
 
+    # Reserve a reusable output buffer for resizing image by scale
+    def acquire_resize_buffer(self, image, scale):
+        shape = (int(image.shape[0] * scale / 100), int(image.shape[1] * scale / 100)) + image.shape[2:]
+        if shape[0] < 1 or shape[1] < 1:
+            return None
+        return self._resize_buffers.acquire(shape, image.dtype)
+
+    # Choosing a final-quality interpolation: area averaging when shrinking, the configured filter when enlarging
+    def quality_interpolation(self, scale):
+        return self.downscale_interpolation if scale < 100 else self.upscale_interpolation
+
+    # Scaling any image by a percentage without touching editor state, so worker threads can use it
+    @staticmethod
+    def scale_image(image, scale, interpolation=cv2.INTER_LINEAR, dst=None):
+        return cv2.resize(image, BaseImageEditor.scaled_size(image, scale), dst=dst, interpolation=interpolation)
+
+    # Width and height of image scaled by a percentage
+    @staticmethod
+    def scaled_size(image, scale):
+        return int(image.shape[1] * scale / 100), int(image.shape[0] * scale / 100)
+
     # Saving the modified image
 
-    def save_image(self, path):
+    @profiled("save")
+    @tracks_peak_memory
+    def save_image(self, path, params=None):
         if self._resized_image is None:
             raise ValueError("No image to save.")
+        if self.is_reduced:
+            self.save_full_resolution(self._source, self.full_resolution_rectangle(), self._scale, path, params)
+        else:
+            self.write_image(path, self._resized_image, params)
+
+    # Render a region of a reduced source at full resolution and save it, streaming tiles to disk
+    # when the work would not fit the tile budget and the output format can be written incrementally
+    @profiled("save.full_resolution")
+    def save_full_resolution(self, source, rectangle, scale, path, params=None):
+        x1, y1, x2, y2 = rectangle
+        out_w, out_h = int((x2 - x1) * scale / 100), int((y2 - y1) * scale / 100)
+        needed = ((x2 - x1) * (y2 - y1) + out_w * out_h) * 3
+        streamable = source.proxy.dtype == np.uint8 and source.proxy.shape[2:] == (3,)  # Tiles are 8-bit BGR
+        if needed > self.tile_budget and streamable and path.lower().endswith(STREAMABLE_EXTENSIONS):
+            try:
+                tiled_crop_resize(source, rectangle, scale, path, self.tile_budget, self.quality_interpolation(scale))
+            except Exception as e:
+                raise IOError(f"Failed to save image: {e}")
+            return
+        region = source.read_region(*rectangle)
+        self.write_image(path, self.scale_image(region, scale, self.quality_interpolation(scale)), params)
+
+    # Encoding an image to disk without touching editor state; params are friendly encoder settings.
+    # .npy has no cv2 writer and stores any depth and channel count, so it is written with np.save
+    @staticmethod
+    def write_image(path, image, params=None):
         try:
-            cv2.imwrite(path, self._resized_image)
+            if path.lower().endswith(".npy"):
+                with open(path, "wb") as f:
+                    np.save(f, image)
+                return
+            flags = encoder_params(os.path.splitext(path)[1], params)
+            check_encodable(os.path.splitext(path)[1], image)
+            if not cv2.imwrite(path, image, flags):
+                raise ValueError(f"Unsupported output path: {path}")
         except Exception as e:
             raise IOError(f"Failed to save image: {e}")
 
+    # Write the crop to several ExportTargets concurrently from one decoded, cropped source.
+    # Each distinct scale is resized once; returns per-target encode time and output size.
+    @profiled("export")
+    def export_image(self, targets, workers=None):
+        if self._cropped_image is None:
+            raise ValueError("No image to export.")
+        crop = self.full_resolution_crop()
+
+        def resize(scale):
+            start = time.perf_counter()
+            resized = self.scale_image(crop, scale, self.quality_interpolation(scale))
+            return resized, time.perf_counter() - start
+
+        def encode(target, resized_future):
+            report = {"path": target.path, "format": target.format, "scale": target.scale,
+                      "params": dict(target.params), "error": None}
+            try:
+                resized, report["resize_seconds"] = resized_future.result()
+                report["size"] = (resized.shape[1], resized.shape[0])
+                flags = encoder_params(target.format, target.params)
+                check_encodable(target.format, resized)
+                start = time.perf_counter()
+                ok, buffer = cv2.imencode("." + target.format, resized, flags)
+                report["encode_seconds"] = time.perf_counter() - start
+                if not ok:
+                    raise ValueError(f"Encoder failed for {target.format}")
+                with open(target.path, "wb") as f:
+                    f.write(buffer)
+                report["bytes"] = int(buffer.size)
+            except Exception as e:
+                report["error"] = str(e)
+            return report
+
+        # Resizes are queued before encodes, so an encode never waits on work that has not been picked up
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            resized = {scale: pool.submit(resize, scale) for scale in {target.scale for target in targets}}
+            reports = [pool.submit(encode, target, resized[target.scale]) for target in targets]
+            return [future.result() for future in reports]
+
+    # Build a ladder of sizes from the crop in one pass. Enlargements are resized from the crop;
+    # reductions cascade, each one area-downscaled from the nearest larger level already built,
+    # so the whole ladder costs little more than its largest member. The 100% level is the crop view.
+    @profiled("derivatives")
+    def build_derivatives(self, scales):
+        if self._cropped_image is None:
+            raise ValueError("No image to resize.")
+        crop = self.full_resolution_crop()
+        crop_h, crop_w = crop.shape[:2]
+        derivatives = {}
+        source = crop
+        for scale in sorted(set(scales), reverse=True):
+            size = (int(crop_w * scale / 100), int(crop_h * scale / 100))
+            if size[0] < 1 or size[1] < 1:
+                raise ValueError(f"Scale {scale:g}% is too small for a {crop_w} × {crop_h} crop.")
+            if scale > 100:
+                derivatives[scale] = cv2.resize(crop, size, interpolation=self.upscale_interpolation)
+            elif scale == 100:
+                derivatives[scale] = crop
+            else:
+                derivatives[scale] = cv2.resize(source, size, interpolation=self.downscale_interpolation)
+                source = derivatives[scale]
+        return derivatives
+
+    # Build a derivative ladder and write it as <stem>_<scale>.<fmt> files in output_dir
+    def write_derivatives(self, output_dir, scales, fmt="png", params=None, stem="crop"):
+        os.makedirs(output_dir, exist_ok=True)
+        fmt = normalise_format(fmt)
+        paths = {scale: os.path.join(output_dir, f"{stem}_{scale:g}.{fmt}") for scale in scales}
+        derivatives = self.build_derivatives(scales)
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            writes = [pool.submit(self.write_image, paths[scale], image, params)
+                      for scale, image in derivatives.items()]
+            for future in writes:
+                future.result()
+        return paths
+
+
+# Headless batch mode: crop and resize many images across a process pool
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+# Collect image paths from a directory or from a manifest file with one path per line
+def collect_batch_paths(source):
+    if os.path.isdir(source):
+        return sorted(os.path.join(source, name) for name in os.listdir(source)
+                      if name.lower().endswith(IMAGE_EXTENSIONS))
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source) as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return paths
+
+# Output path and ExportTargets for every source in output_dir. Sources from different folders can
+# share a file name, and an export such as photo_50.jpg can match another source's name, so every
+# file name is reserved once and later clashes get the source's index as a suffix instead of
+# overwriting an earlier result
+def batch_output_paths(paths, output_dir, exports=()):
+    outputs, used = [], set()
+
+    def reserve(name, index):
+        if name.lower() in used:
+            stem, extension = os.path.splitext(name)
+            name, attempt = f"{stem}_{index}{extension}", 0
+            while name.lower() in used:
+                attempt += 1
+                name = f"{stem}_{index}_{attempt}{extension}"
+        used.add(name.lower())
+        return os.path.join(output_dir, name)
+
+    for index, path in enumerate(paths):
+        output_path = reserve(os.path.basename(path), index)
+        targets = export_targets(output_path, exports)
+        for target in targets:
+            target.path = reserve(os.path.basename(target.path), index)
+        outputs.append((output_path, targets))
+    return outputs
+
+# Parse a crop spec of the form "x1,y1,x2,y2"
+def parse_crop_spec(spec):
+    if not spec:
+        return None
+    values = [int(v) for v in spec.split(",")]
+    if len(values) != 4:
+        raise ValueError(f"Crop spec must be x1,y1,x2,y2, got: {spec}")
+    return values
+
+# Parse an export spec of the form "format[:setting=value,...][@scale]", e.g. "jpg:quality=85,progressive=1@50"
+def parse_export_spec(spec):
+    spec, _, scale = spec.partition("@")
+    fmt, _, settings = spec.partition(":")
+    params = {}
+    for setting in filter(None, settings.split(",")):
+        name, _, value = setting.partition("=")
+        params[name.strip()] = int(value)
+    encoder_params(fmt, params)  # Reject unknown settings before any work starts
+    return normalise_format(fmt), params, float(scale) if scale else 100.0
+
+# Build ExportTargets next to output_path, one file per export spec
+def export_targets(output_path, exports):
+    stem = os.path.splitext(output_path)[0]
+    targets, used = [], set()
+    for index, (fmt, params, scale) in enumerate(exports):
+        path = f"{stem}_{scale:g}.{fmt}"
+        if path in used:
+            path = f"{stem}_{scale:g}_{index}.{fmt}"
+        used.add(path)
+        targets.append(ExportTarget(path, scale, params, fmt))
+    return targets
+
+# Each worker process keeps a single editor and reuses it for every file it receives
+_batch_editor = None
+
+def _init_batch_worker(track_memory=False, cache_dir=None, preserve_depth=False, cache_max_bytes=2 ** 30):
+    global _batch_editor
+    cv2.setNumThreads(1)  # Parallelism comes from the pool, avoid oversubscribing cores
+    _batch_editor = BaseImageEditor()
+    _batch_editor.track_memory = track_memory
+    _batch_editor.preserve_depth = preserve_depth
+    if cache_dir:
+        # Each worker sees a source once, so only the shared disk tier can produce hits
+        _batch_editor.render_cache = RenderCache(max_bytes=0, disk_dir=cache_dir, disk_max_bytes=cache_max_bytes)
+
+# Run load -> crop -> resize -> save for one file, returning timings and any error
+def _process_batch_item(index, path, output_path, crop, scale, targets=None, auto_crop=None):
+    editor = _batch_editor if _batch_editor is not None else BaseImageEditor()
+    result = {"index": index, "path": path, "output": output_path, "error": None, "timings": {}}
+    timings = result["timings"]
+    editor.memory_stats.clear()
+    start = time.perf_counter()
+    try:
+        stage_start = time.perf_counter()
+        editor.load_image(path)
+        timings["load"] = time.perf_counter() - stage_start
+
+        if auto_crop is not None:
+            stage_start = time.perf_counter()
+            editor.auto_crop(*auto_crop)
+            timings["auto_crop"] = time.perf_counter() - stage_start
+        elif crop is not None:
+            editor.set_crop_rectangle(crop)
+
+        stage_start = time.perf_counter()
+        editor.crop_image()
+        timings["crop"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        before = editor.render_cache.stats() if editor.render_cache is not None else None
+        editor.resize_image(scale)
+        timings["resize"] = time.perf_counter() - stage_start
+        if before is not None:
+            after = editor.render_cache.stats()
+            result["cache"] = {name: after[name] - before[name] for name in ("hits", "disk_hits", "misses")}
+
+        stage_start = time.perf_counter()
+        editor.save_image(output_path)
+        timings["save"] = time.perf_counter() - stage_start
+
+        if targets:
+            # Exports are written next to the main output, every target rendered from the single decoded crop
+            stage_start = time.perf_counter()
+            result["exports"] = editor.export_image(targets, workers=1)
+            timings["export"] = time.perf_counter() - stage_start
+            failed = [report["error"] for report in result["exports"] if report["error"]]
+            if failed:
+                raise IOError("; ".join(failed))
+    except Exception as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - start
+    if editor.track_memory:
+        result["peak_memory"] = dict(editor.memory_stats)
+    return result
+
+# Process a list of images in parallel, keeping at most max_in_flight jobs queued at once
+def batch_process(paths, output_dir, crop=None, scale=100, workers=None, max_in_flight=None, callback=None,
+                  track_memory=False, exports=None, cache_dir=None, preserve_depth=False, auto_crop=None,
+                  cache_max_bytes=2 ** 30):
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or workers * 2)
+    results = []
+    pending = set()
+
+    def collect(done):
+        for future in done:
+            result = future.result()
+            results.append(result)
+            if callback is not None:
+                callback(result)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(track_memory, cache_dir, preserve_depth, cache_max_bytes)) as pool:
+        outputs = batch_output_paths(paths, output_dir, exports or ())
+        for index, (path, (output_path, targets)) in enumerate(zip(paths, outputs)):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(_process_batch_item, index, path, output_path, crop, scale, targets, auto_crop))
+        done, _ = wait(pending)
+        collect(done)
+
+    results.sort(key=lambda r: r["index"])
+    return results
+
+# Command-line front end for batch_process
+def run_batch_cli(args):
+    paths = collect_batch_paths(args.batch)
+    crop = args.crop
+
+    def report(result):
+        if result["error"]:
+            print(f"FAILED {result['path']}: {result['error']}", file=sys.stderr)
+        else:
+            print(f"{result['path']} -> {result['output']} ({result['seconds'] * 1000:.1f} ms)")
+        for report in result.get("exports", []):
+            if not report["error"]:
+                print(f"    {report['path']}: {report['bytes'] / 1024:.1f} KiB, "
+                      f"encode {report['encode_seconds'] * 1000:.1f} ms")
+        if "peak_memory" in result:
+            peaks = ", ".join(f"{op} {size / 2 ** 20:.1f} MB" for op, size in result["peak_memory"].items())
+            print(f"    peak memory: {peaks}")
+
+    profiler = StageProfiler(window=max(1, len(paths))) if args.profile else None
+
+    def record(result):
+        report(result)
+        if profiler is not None and not result["error"]:
+            for stage, seconds in result["timings"].items():
+                profiler.record(stage, seconds)
+            profiler.record("total", result["seconds"])
+
+    start = time.perf_counter()
+    exports = args.export or []
+    results = batch_process(paths, args.output, crop, args.scale, args.workers, args.max_in_flight, record,
+                            args.track_memory, exports, args.render_cache, args.preserve_depth, args.auto_crop,
+                            int(args.render_cache_mb * 2 ** 20))
+    elapsed = time.perf_counter() - start
+    failures = sum(1 for r in results if r["error"])
+    rate = len(results) / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {len(results)} images in {elapsed:.2f}s ({rate:.1f} images/s), {failures} failed")
+    if profiler is not None:
+        profiler.export(args.profile)
+        print(f"Stage latencies written to {args.profile}")
+    lookups = [r["cache"] for r in results if "cache" in r]
+    if lookups:
+        # Workers count their own lookups; the directory size is measured once the run is over
+        totals = {name: sum(lookup[name] for lookup in lookups) for name in ("hits", "disk_hits", "misses")}
+        disk_bytes = RenderCache(max_bytes=0, disk_dir=args.render_cache).stats()["disk_bytes"]
+        print(f"Render cache: {totals['hits'] + totals['disk_hits']} hits ({totals['disk_hits']} from disk), "
+              f"{totals['misses']} misses, {disk_bytes / 2 ** 20:.1f} MiB on disk")
+    return 1 if failures else 0
+
+# Manifest mode: many crops per image, each source decoded once
+MANIFEST_FIELDS = ("path", "x1", "y1", "x2", "y2", "scale", "output")
+
+# Stream entries from a manifest of CSV rows "path,x1,y1,x2,y2,scale,output" or JSON lines with those keys.
+# Source paths are relative to the manifest, outputs to output_dir; malformed lines become failed entries.
+def read_crop_manifest(manifest_path, output_dir):
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, newline="") as manifest:
+        for number, line in enumerate(manifest, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = {"index": number, "path": None, "output": None, "error": None}
+            try:
+                if line.startswith("{"):
+                    record = json.loads(line)
+                else:
+                    record = dict(zip(MANIFEST_FIELDS, (v.strip() for v in next(csv.reader([line])))))
+                    if record["path"] == "path":
+                        continue  # Header row
+                missing = [field for field in MANIFEST_FIELDS if field != "scale" and record.get(field) in (None, "")]
+                if missing:
+                    raise ValueError(f"missing {', '.join(missing)}")
+                entry["path"] = os.path.join(base_dir, record["path"])
+                entry["output"] = os.path.join(output_dir, record["output"])
+                entry["crop"] = [int(record[field]) for field in ("x1", "y1", "x2", "y2")]
+                entry["scale"] = float(record.get("scale") or 100)
+            except (ValueError, TypeError) as e:
+                entry["error"] = f"Manifest line {number}: {e}"
+            yield entry
+
+# Height and width of an image as BaseImageEditor.load_image will decode it (EXIF rotation included),
+# read from the header without decoding pixels
+def read_image_shape(path, preserve_depth=False):
+    if path.lower().endswith(".npy"):
+        return np.load(path, mmap_mode="r").shape[:2]
+    flags = preserving_imread_flags(path) if preserve_depth else cv2.IMREAD_COLOR
+    with Image.open(path) as header:
+        return decoded_size(header, flags)[::-1]
+
+# Reject crop rectangles outside the image and scales that leave no pixels
+def validate_crop_entry(entry, shape):
+    height, width = shape
+    x1, y1, x2, y2 = entry["crop"]
+    if not (0 <= x1 < x2 <= width and 0 <= y1 < y2 <= height):
+        raise ValueError(f"Crop rectangle {entry['crop']} is outside the {width} × {height} image")
+    if int((x2 - x1) * entry["scale"] / 100) < 1 or int((y2 - y1) * entry["scale"] / 100) < 1:
+        raise ValueError(f"Scale {entry['scale']:g}% leaves no pixels for crop {entry['crop']}")
+
+# Decode one source and write every crop listed for it
+def _process_manifest_group(path, entries):
+    editor = _batch_editor if _batch_editor is not None else BaseImageEditor()
+    try:
+        editor.load_image(path)
+    except Exception as e:
+        return [dict(entry, error=str(e), seconds=0.0) for entry in entries]
+    results = []
+    for entry in entries:
+        result = dict(entry)
+        start = time.perf_counter()
+        try:
+            editor.set_crop_rectangle(entry["crop"])
+            editor.crop_image()
+            editor.resize_image(entry["scale"])
+            os.makedirs(os.path.dirname(entry["output"]) or ".", exist_ok=True)
+            editor.save_image(entry["output"])
+        except Exception as e:
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - start
+        results.append(result)
+    return results
+
+# Process a crop manifest: every entry is parsed and validated against its image header first,
+# then each source is decoded once in the process pool for all of its crops
+def manifest_process(manifest_path, output_dir, workers=None, max_in_flight=None, callback=None,
+                     preserve_depth=False):
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or workers * 2)
+    results = []
+    groups = OrderedDict()  # Source path -> valid entries, in first-seen order
+    shapes = {}
+
+    def collect(entries):
+        for result in entries:
+            results.append(result)
+            if callback is not None:
+                callback(result)
+
+    for entry in read_crop_manifest(manifest_path, output_dir):
+        if entry["error"] is None:
+            try:
+                if entry["path"] not in shapes:
+                    shapes[entry["path"]] = read_image_shape(entry["path"], preserve_depth)
+                validate_crop_entry(entry, shapes[entry["path"]])
+            except Exception as e:
+                entry["error"] = f"Manifest line {entry['index']}: {e}"
+        if entry["error"] is not None:
+            collect([dict(entry, seconds=0.0)])
+        else:
+            groups.setdefault(entry["path"], []).append(entry)
+
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(False, None, preserve_depth)) as pool:
+        for path, entries in groups.items():
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+            pending.add(pool.submit(_process_manifest_group, path, entries))
+        done, _ = wait(pending)
+        for future in done:
+            collect(future.result())
+
+    results.sort(key=lambda r: r["index"])
+    return results
+
+# Command-line front end for manifest_process
+def run_manifest_cli(args):
+    def report(result):
+        if result["error"]:
+            source = f"{result['path']}: " if result["path"] else ""
+            print(f"FAILED {source}{result['error']}", file=sys.stderr)
+        else:
+            print(f"{result['path']} {result['crop']} -> {result['output']} ({result['seconds'] * 1000:.1f} ms)")
+
+    start = time.perf_counter()
+    results = manifest_process(args.manifest, args.output, args.workers, args.max_in_flight, report,
+                               args.preserve_depth)
+    elapsed = time.perf_counter() - start
+    failures = sum(1 for r in results if r["error"])
+    sources = len({r["path"] for r in results if not r["error"]})
+    print(f"Wrote {len(results) - failures} crops from {sources} images in {elapsed:.2f}s, {failures} failed")
+    return 1 if failures else 0
+
+# A single edit as parameters only; images are re-rendered from these on demand
+EditRecord = namedtuple("EditRecord", "crop scale interpolation")
+
+
+# Undo/redo stack of EditRecords
+class EditHistory:
+    def __init__(self, limit=1000):
+        self.limit = limit
+        self._records = []
+        self._index = -1
+
+    def clear(self):
+        self._records = []
+        self._index = -1
+
+    @property
+    def current(self):
+        return self._records[self._index] if self._records else None
+
+    # Record a new state, dropping any redo branch; repeating the current state is a no-op
+    def push(self, record):
+        if record == self.current:
+            return False
+        del self._records[self._index + 1:]
+        self._records.append(record)
+        if len(self._records) > self.limit:
+            del self._records[0]
+        self._index = len(self._records) - 1
+        return True
+
+    def undo(self):
+        if self._index <= 0:
+            return None
+        self._index -= 1
+        return self._records[self._index]
+
+    def redo(self):
+        if self._index >= len(self._records) - 1:
+            return None
+        self._index += 1
+        return self._records[self._index]
+
+
+# Hit testing for the crop rectangle's eight resize handles and its interior, in canvas pixels.
+# Zone edges are computed once per rectangle change, so each motion event costs a few comparisons.
+class CropHandles:
+    NAMES = {("low", "low"): "topleft", ("mid", "low"): "top", ("high", "low"): "topright",
+             ("low", "mid"): "left", ("mid", "mid"): "move", ("high", "mid"): "right",
+             ("low", "high"): "bottomleft", ("mid", "high"): "bottom", ("high", "high"): "bottomright"}
+    CURSORS = {"topleft": "top_left_corner", "top": "sb_v_double_arrow", "topright": "top_right_corner",
+               "left": "sb_h_double_arrow", "move": "fleur", "right": "sb_h_double_arrow",
+               "bottomleft": "bottom_left_corner", "bottom": "sb_v_double_arrow",
+               "bottomright": "bottom_right_corner"}
+
+    def __init__(self, margin=8):
+        self.margin = margin
+        self._x_edges = self._y_edges = None
+
+    # Handle bands around each side, split at the midpoint when the rectangle is narrower than two bands
+    def update(self, x1, y1, x2, y2):
+        self._x_edges = self._edges(x1, x2)
+        self._y_edges = self._edges(y1, y2)
+
+    def _edges(self, low, high):
+        middle = (low + high) / 2
+        return low - self.margin, min(low + self.margin, middle), max(high - self.margin, middle), high + self.margin
+
+    @staticmethod
+    def _zone(value, edges):
+        outer_low, inner_low, inner_high, outer_high = edges
+        if value < outer_low or value > outer_high:
+            return None
+        return "low" if value < inner_low else "mid" if value <= inner_high else "high"
+
+    # Name of the handle under (x, y), "move" inside the rectangle, or None outside it
+    def hit(self, x, y):
+        if self._x_edges is None:
+            return None
+        return self.NAMES.get((self._zone(x, self._x_edges), self._zone(y, self._y_edges)))
+
+
+# New crop rectangle after dragging handle by (dx, dy) from rectangle, kept inside a width x height image.
+# With aspect (width / height) the opposite side or corner stays fixed and edge drags grow about the centre.
+def drag_rectangle(rectangle, handle, dx, dy, width, height, aspect=None, min_size=10):
+    x1, y1, x2, y2 = rectangle
+    if handle == "move":
+        dx, dy = max(-x1, min(dx, width - x2)), max(-y1, min(dy, height - y2))
+        return [x1 + dx, y1 + dy, x2 + dx, y2 + dy]
+    if aspect is None:
+        if "left" in handle:
+            x1 = max(0, min(x1 + dx, x2 - min_size))
+        if "right" in handle:
+            x2 = min(width, max(x2 + dx, x1 + min_size))
+        if "top" in handle:
+            y1 = max(0, min(y1 + dy, y2 - min_size))
+        if "bottom" in handle:
+            y2 = min(height, max(y2 + dy, y1 + min_size))
+        return [x1, y1, x2, y2]
+
+    # Anchor each axis at the side opposite the handle, or at the centre when the handle does not move that axis
+    horizontal = "left" in handle or "right" in handle
+    vertical = "top" in handle or "bottom" in handle
+    anchor_x = x2 if "left" in handle else x1 if "right" in handle else (x1 + x2) / 2
+    anchor_y = y2 if "top" in handle else y1 if "bottom" in handle else (y1 + y2) / 2
+    new_w = (x2 - x1) + (-dx if "left" in handle else dx if "right" in handle else 0)
+    new_h = (y2 - y1) + (-dy if "top" in handle else dy if "bottom" in handle else 0)
+    if horizontal and vertical:
+        # Corners follow whichever axis the mouse moved further
+        if abs(new_h * aspect - (x2 - x1)) > abs(new_w - (x2 - x1)):
+            new_w = new_h * aspect
+    elif vertical:
+        new_w = new_h * aspect
+
+    # Largest width the anchors leave room for, on both axes
+    if "left" in handle:
+        room_w = anchor_x
+    elif "right" in handle:
+        room_w = width - anchor_x
+    else:
+        room_w = 2 * min(anchor_x, width - anchor_x)
+    if "top" in handle:
+        room_h = anchor_y
+    elif "bottom" in handle:
+        room_h = height - anchor_y
+    else:
+        room_h = 2 * min(anchor_y, height - anchor_y)
+    new_w = max(min_size * max(1, aspect), min(new_w, room_w, room_h * aspect))
+    new_h = new_w / aspect
+
+    x1 = anchor_x - new_w if "left" in handle else anchor_x if "right" in handle else anchor_x - new_w / 2
+    y1 = anchor_y - new_h if "top" in handle else anchor_y if "bottom" in handle else anchor_y - new_h / 2
+    x1, y1 = max(0, round(x1)), max(0, round(y1))
+    return [x1, y1, min(width, x1 + round(new_w)), min(height, y1 + round(new_h))]
+
+
+# Decodes images ahead of use on a small thread pool, keeping finished results in a byte-bounded LRU cache.
+# load(path) runs on the pool and returns (editor, display preview). Call from one thread only.
+class ImagePrefetcher:
+    def __init__(self, load, max_bytes=256 * 2 ** 20, workers=2):
+        self._load = load
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._cache = LRURenderCache(max_bytes)
+        self._futures = {}  # Path -> decode not yet moved into the cache
+
+    # A future for path's decode, reusing a cached or in-flight one
+    def request(self, path):
+        self._collect()
+        loaded = self._cache.get(path)
+        if loaded is not None:
+            future = Future()
+            future.set_result(loaded)
+            return future
+        future = self._futures.get(path)
+        if future is None or future.cancelled():
+            future = self._futures[path] = self._executor.submit(self._load, path)
+        return future
+
+    # Decode paths that are neither cached nor in flight; queued decodes for other paths are dropped
+    def prefetch(self, paths):
+        self._collect()
+        for path, future in list(self._futures.items()):
+            if path not in paths and future.cancel():
+                del self._futures[path]
+        for path in paths:
+            if self._cache.get(path) is None and path not in self._futures:
+                self._futures[path] = self._executor.submit(self._load, path)
+
+    # Move finished decodes into the cache; failed ones are forgotten so a later request retries them
+    def _collect(self):
+        for path, future in list(self._futures.items()):
+            if not future.done():
+                continue
+            del self._futures[path]
+            if not future.cancelled() and future.exception() is None:
+                editor, (display, _) = future.result()
+                self._cache.put(path, future.result(), editor._image.nbytes + display.nbytes)
+
+
 # GUI-based Image Crop and Resize Editor using OpenCV, Tkinter, and PIL
 class ImageEditorApp(BaseImageEditor):
     def __init__(self, root):
@@ -72,9 +1514,11 @@ class ImageEditorApp(BaseImageEditor):
         self.frame = Frame(root)
         self.frame.pack()
 
-        # Label to show the original image with crop overlay
-        self.original_label = Label(self.frame)
-        self.original_label.grid(row=0, column=0)
+        # Canvas showing the original image once; the crop overlay is drawn as vector items on top
+        self.original_canvas = Canvas(self.frame, width=0, height=0, highlightthickness=0, borderwidth=0)
+        self.original_canvas.grid(row=0, column=0)
+        self._canvas_image_item = None
+        self._crop_overlay_items = []  # Crop frame followed by the eight handle nodes
 
         # Label to show the cropped/preview image
         self.preview_frame = Frame(self.frame, width=300, height=300)
@@ -126,6 +1570,44 @@ class ImageEditorApp(BaseImageEditor):
         )
         self.save_button.grid(row=0, column=1, padx=10)
 
+        self.previous_button = Button(
+            self.button_frame,
+            background='#01016F',
+            foreground='#FFFFFF',
+            activebackground='#0000FF',
+            activeforeground='#FFFFFF',
+            highlightthickness=2,
+            highlightbackground='#0000FF',
+            highlightcolor='#FFFFFF',
+            width=6,
+            height=1,
+            border=0,
+            cursor='hand2',
+            text="◀ Prev",
+            font=('Arial', 12),
+            command=lambda: self.show_adjacent_image(-1)
+        )
+        self.previous_button.grid(row=0, column=2, padx=(10, 2))
+
+        self.next_button = Button(
+            self.button_frame,
+            background='#01016F',
+            foreground='#FFFFFF',
+            activebackground='#0000FF',
+            activeforeground='#FFFFFF',
+            highlightthickness=2,
+            highlightbackground='#0000FF',
+            highlightcolor='#FFFFFF',
+            width=6,
+            height=1,
+            border=0,
+            cursor='hand2',
+            text="Next ▶",
+            font=('Arial', 12),
+            command=lambda: self.show_adjacent_image(1)
+        )
+        self.next_button.grid(row=0, column=3, padx=(2, 10))
+
         # Slider to resize cropped image by percentage
         self.slider_frame = Frame(root)
         self.slider_frame.pack(pady=5)
@@ -155,22 +1637,88 @@ class ImageEditorApp(BaseImageEditor):
         self.resized_shape_label.pack()
 
         # Initialize state variables
-        self.drag_mode = None  # Mode used while dragging to resize crop area
+        self.drag_mode = None  # Handle being dragged, see CropHandles
         self.drag_start = (0, 0)  # Initial mouse position during dragging
-        self.hover_side = None  # Current side hovered for visual feedback
+        self.drag_origin = None  # Crop rectangle when the drag started
+        self.hover_side = None  # Current handle hovered for visual feedback
+        self.handles = CropHandles()
+
+        # Crop constraints: a locked width / height ratio, or an exact output size in source pixels
+        self.aspect_lock = None
+        self.exact_output = None
+
+        # Latency profiling is always collected; the overlay listing it is toggled with Ctrl+P
+        self.profiler = StageProfiler()
+        self.profiler_label = Label(root, text="", font=("Courier", 9), bg="black", fg="#00FF00", justify="left")
+        self._profiler_job = None
+
+        # Display cache: screen-sized RGB copy of the source, rebuilt once per load
+        self._display_base = None
+        self._display_scale = 1.0
+        self._rendered_crop = None  # Crop rectangle last drawn to the screen
+        self._rendered_scale = None  # Slider value last rendered in the preview
+
+        # Render scheduler: crop and scale changes are coalesced into at most one render per frame
+        self.target_frame_rate = 60  # Upper bound on renders per second while dragging
+        self.dropped_render_events = 0  # Events merged into an already scheduled render
+        self._render_job = None
+        self._pending_scale = None
+        self._last_render_time = 0.0
+
+        # Background worker: decode, resize and encode run off the Tk thread. Results come back
+        # through a queue polled from the Tk loop, and a newer task of the same kind makes older ones stale.
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task_results = queue.Queue()
+        self._task_generation = {}  # Latest generation number per task kind
+        self._task_futures = {}  # Latest future per task kind
+        self.root.after(30, self._poll_background_results)
+
+        # Progressive resize: a cheap preview-sized resize while the slider moves,
+        # then the full-resolution quality resize once it has settled
+        self.preview_interpolation = cv2.INTER_LINEAR
+        self.settle_delay_ms = 250
+        self._settle_job = None
+
+        # Images are opened as proxies no larger than needed for display and crop selection,
+        # keeping their bit depth and alpha; only the on-screen previews are tone-mapped to 8-bit
+        self.proxy_size = (1000, 1000)
+        self.preserve_depth = True
+
+        # Folder browsing: the prefetch_count images either side of the current one are decoded ahead
+        self.folder_paths = []
+        self.folder_index = None
+        self.prefetch_count = 2
+        self.prefetcher = ImagePrefetcher(self.decode_for_display)
+
+        # Edit history keeps parameters only; rendered results and previews live in the render cache
+        self.history = EditHistory()
+        self.render_cache = RenderCache()
 
         # Mouse events to support cropping and resizing
-        self.original_label.bind("<Motion>", self.on_mouse_move)
-        self.original_label.bind("<Button-1>", self.start_resize)
-        self.original_label.bind("<B1-Motion>", self.do_resize)
-        self.original_label.bind("<ButtonRelease-1>", self.end_resize)
+        self.original_canvas.bind("<Motion>", self.on_mouse_move)
+        self.original_canvas.bind("<Button-1>", self.start_resize)
+        self.original_canvas.bind("<B1-Motion>", self.do_resize)
+        self.original_canvas.bind("<ButtonRelease-1>", self.end_resize)
 
         # Bind keyboard shortcuts to corresponding image actions
         self.root.bind_all("<Control-o>", self.load_image_event)
         self.root.bind_all("<Control-s>", self.save_image_event)
         self.root.bind_all("<Control-r>", self.reset_crop_event)
+        self.root.bind_all("<Control-a>", self.auto_crop_event)
+        self.root.bind_all("<Control-l>", self.aspect_lock_event)
+        self.root.bind_all("<Control-e>", self.exact_output_event)
+        self.root.bind_all("<Control-p>", self.profiler_overlay_event)
+        self.root.bind_all("<Control-P>", self.export_profile_event)  # Ctrl+Shift+P
+        self.root.bind_all("<Control-z>", self.undo_event)
+        self.root.bind_all("<Control-y>", self.redo_event)
+        self.root.bind_all("<Control-Z>", self.redo_event)  # Ctrl+Shift+Z
+        self.root.bind_all("<Control-Left>", lambda event: self.show_adjacent_image(-1))
+        self.root.bind_all("<Control-Right>", lambda event: self.show_adjacent_image(1))
 
-        Label(root, text="Load(Ctrl+O), Save(Ctrl+S), Reset(Ctrl+R)", bg="#cecece", fg="black").place(x=0, y=0)
+        Label(root, text="Load(Ctrl+O), Save(Ctrl+S), Reset(Ctrl+R), Auto crop(Ctrl+A), Undo(Ctrl+Z), Redo(Ctrl+Y), "
+                         "Prev/Next(Ctrl+←/→), Lock aspect(Ctrl+L), Exact size(Ctrl+E), "
+                         "Profiler(Ctrl+P), Export profile(Ctrl+Shift+P)",
+              bg="#cecece", fg="black").place(x=0, y=0)
 
     # Event Handlers
     def load_image_event(self, event=None):
@@ -182,192 +1730,606 @@ class ImageEditorApp(BaseImageEditor):
     def reset_crop_event(self, event=None):
         if self._image is not None:
             h, w = self._image.shape[:2]
-            crop_w, crop_h = w // 2, h // 2
+            crop_w, crop_h = self.fixed_crop_size() or (w // 2, h // 2)
             x1, y1 = (w - crop_w) // 2, (h - crop_h) // 2
             self._crop_rectangle = [x1, y1, x1 + crop_w, y1 + crop_h]
             self.update_display()
+            self.record_edit()
             self.application_message_label.config(text="Crop area reset.")
 
+    # Move the crop to the most salient region, keeping the current crop's aspect ratio and size
+    def auto_crop_event(self, event=None):
+        if self._image is None:
+            return
+        h, w = self._image.shape[:2]
+        x1, y1, x2, y2 = self._crop_rectangle
+        aspect = (x2 - x1) / (y2 - y1)
+        self.auto_crop(aspect, min(1.0, max((x2 - x1) / w, (y2 - y1) / h)))
+        if self.exact_output is not None:
+            self._crop_rectangle = self.fixed_rectangle(*self._crop_rectangle[:2])
+        self.update_display()
+        self.record_edit()
+        self.application_message_label.config(text="Crop moved to the most detailed region.", fg='black')
+
+    # Toggle locking the crop to its current width / height ratio
+    def aspect_lock_event(self, event=None):
+        if self._image is None:
+            return
+        if self.aspect_lock is None:
+            x1, y1, x2, y2 = self._crop_rectangle
+            self.aspect_lock = (x2 - x1) / (y2 - y1)
+            self.application_message_label.config(text=f"Aspect ratio locked at {self.aspect_lock:.3g}:1.", fg='black')
+        else:
+            self.aspect_lock = None
+            self.application_message_label.config(text="Aspect ratio unlocked.", fg='black')
+
+    # Toggle exact output mode: the crop is fixed at width x height source pixels and can only be moved,
+    # and the result is saved at 100% so the output has exactly that many pixels
+    def exact_output_event(self, event=None):
+        if self._image is None:
+            return
+        if self.exact_output is not None:
+            self.exact_output = None
+            self.resize_slider.configure(state="normal")
+            self.application_message_label.config(text="Exact output size off.", fg='black')
+            return
+        answer = simpledialog.askstring("Exact output size", "Output size in pixels (width x height):")
+        if not answer:
+            return
+        try:
+            width, height = [int(v) for v in answer.lower().replace("×", "x").split("x")]
+        except ValueError:
+            self.application_message_label.config(text=f"Not a size: {answer}", fg='red')
+            return
+        full_h, full_w = self._source.shape if self.is_reduced else self._image.shape[:2]
+        if not (0 < width <= full_w and 0 < height <= full_h):
+            self.application_message_label.config(text=f"Size must fit within {full_w} × {full_h}.", fg='red')
+            return
+
+        self.exact_output = (width, height)
+        x1, y1, x2, y2 = self._crop_rectangle
+        crop_w, crop_h = self.fixed_crop_size()
+        self._crop_rectangle = self.fixed_rectangle((x1 + x2 - crop_w) // 2, (y1 + y2 - crop_h) // 2)
+        self.resize_slider.set(100)
+        self.resize_slider.configure(state="disabled")
+        self.slider_label.config(text="100%")
+        self._rendered_crop = None  # Also re-renders the preview at 100%
+        self.update_display()
+        self._scale = 100
+        self.record_edit()
+        self.application_message_label.config(text=f"Output fixed at {width} × {height} pixels.", fg='black')
+
+    # Size in _image coordinates of the exact output crop, or None when that mode is off
+    def fixed_crop_size(self):
+        if self.exact_output is None:
+            return None
+        width, height = self.exact_output
+        if self.is_reduced:
+            (full_h, full_w), (proxy_h, proxy_w) = self._source.shape, self._image.shape[:2]
+            width, height = max(1, round(width * proxy_w / full_w)), max(1, round(height * proxy_h / full_h))
+        return width, height
+
+    # The fixed-size crop rectangle at (x1, y1), shifted to lie inside the image
+    def fixed_rectangle(self, x1, y1):
+        crop_w, crop_h = self.fixed_crop_size()
+        h, w = self._image.shape[:2]
+        x1, y1 = max(0, min(x1, w - crop_w)), max(0, min(y1, h - crop_h))
+        return [x1, y1, x1 + crop_w, y1 + crop_h]
+
+    # A reduced proxy cannot represent every full-resolution size, so exact output is enforced here
+    def full_resolution_rectangle(self):
+        rectangle = super().full_resolution_rectangle()
+        if self.exact_output is None:
+            return rectangle
+        width, height = self.exact_output
+        full_h, full_w = self._source.shape if self.is_reduced else self._image.shape[:2]
+        x1, y1 = min(rectangle[0], full_w - width), min(rectangle[1], full_h - height)
+        return [x1, y1, x1 + width, y1 + height]
+
+    # Show or hide the latency overlay
+    def profiler_overlay_event(self, event=None):
+        if self._profiler_job is not None:
+            self.root.after_cancel(self._profiler_job)
+            self._profiler_job = None
+            self.profiler_label.place_forget()
+        else:
+            self.profiler_label.place(relx=1.0, rely=1.0, anchor="se")
+            self.refresh_profiler_overlay()
+
+    # Redraw the overlay twice a second while it is shown
+    def refresh_profiler_overlay(self):
+        lines = [f"{'stage':<22}{'n':>5}{'p50':>8}{'p95':>8}{'p99':>8} ms"]
+        for stage, row in sorted(self.profiler.summary().items()):
+            lines.append(f"{stage:<22}{row['count']:>5}{row['p50_ms']:>8.2f}{row['p95_ms']:>8.2f}{row['p99_ms']:>8.2f}")
+        self.profiler_label.config(text="\n".join(lines))
+        self._profiler_job = self.root.after(500, self.refresh_profiler_overlay)
+
+    # Save the current latency statistics as JSON or CSV
+    def export_profile_event(self, event=None):
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON Files", "*.json"), ("CSV Files", "*.csv")])
+        if path:
+            self.profiler.export(path)
+            self.application_message_label.config(text=f"Profile saved to {path}", fg='green')
+
+    def undo_event(self, event=None):
+        record = self.history.undo()
+        if record is not None:
+            self.apply_edit(record)
+            self.application_message_label.config(text="Undo.", fg='black')
+
+    def redo_event(self, event=None):
+        record = self.history.redo()
+        if record is not None:
+            self.apply_edit(record)
+            self.application_message_label.config(text="Redo.", fg='black')
+
+    # The current crop and scale as a history record
+    def current_edit(self):
+        scale = self._rendered_scale if self._rendered_scale is not None else 100
+        return EditRecord(tuple(self._crop_rectangle), scale, self.quality_interpolation(scale))
+
+    # Add the current state to the undo history
+    def record_edit(self):
+        if self._image is not None:
+            self.history.push(self.current_edit())
+
+    # Restore a recorded state, re-rendering it from the cache when possible
+    def apply_edit(self, record):
+        if self._settle_job is not None:
+            self.root.after_cancel(self._settle_job)
+            self._settle_job = None
+        self._crop_rectangle = list(record.crop)
+        self.update_display()
+        self.resize_slider.set(record.scale)
+        self.slider_label.config(text=f"{int(record.scale)}%")
+        if record.scale == 100:
+            if self._rendered_scale is not None:
+                self._rendered_crop = None
+                self.update_display()
+            self._scale = 100
+            return
+
+        full_w, full_h = self.output_size(record.scale)
+        self.resized_shape_label.config(text=f"Resized Image: {full_w} × {full_h}")
+        self._rendered_scale = record.scale
+        self.render_full_resolution(record.scale)
+
+    # Run work on the background thread and hand its result to on_done on the Tk thread
+    def run_in_background(self, kind, work, on_done, status=None):
+        self.cancel_background(kind)
+        return self.deliver_result(kind, self._executor.submit(work), on_done, status)
+
+    # Hand a future's result to on_done on the Tk thread, unless a newer task of the same kind replaces it
+    def deliver_result(self, kind, future, on_done, status=None):
+        self.cancel_background(kind)
+        generation = self._task_generation.get(kind, 0)
+        if status:
+            self.application_message_label.config(text=status, fg='black')
+        self._task_futures[kind] = future
+        future.add_done_callback(lambda f: self._task_results.put((kind, generation, f, on_done)))
+        return future
+
+    # Make any queued or running task of this kind stale; queued ones never start
+    def cancel_background(self, kind):
+        self._task_generation[kind] = self._task_generation.get(kind, 0) + 1
+        future = self._task_futures.pop(kind, None)
+        if future is not None:
+            future.cancel()
+
+    # Deliver finished background results on the Tk thread, dropping stale or cancelled ones
+    def _poll_background_results(self):
+        while True:
+            try:
+                kind, generation, future, on_done = self._task_results.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or generation != self._task_generation.get(kind):
+                continue
+            self._task_futures.pop(kind, None)
+            try:
+                on_done(future.result())
+            except Exception as e:
+                self.application_message_label.config(text=str(e), fg='red')
+        self.root.after(30, self._poll_background_results)
+
     # Load an image using file dialog and initialize crop area in center
     def ui_load_image(self):
         path = filedialog.askopenfilename()
-        if not path:
+        if path:
+            self.open_path(path)
+
+    # Decode path into a fresh editor and its display preview; runs on worker threads
+    def decode_for_display(self, path):
+        editor = BaseImageEditor()
+        editor.preserve_depth = self.preserve_depth
+        editor.profiler = self.profiler
+        editor.load_image(path, proxy_size=self.proxy_size)
+        with self.timed("load.hash"):
+            editor.source_key  # Hash the file here rather than on the first render
+        return editor, self.make_display_base(editor._image, profiler=self.profiler)
+
+    # Show path, taking it from the prefetch cache when it has already been decoded
+    def open_path(self, path):
+        future = self.prefetcher.request(os.path.abspath(path))
+        status = None if future.done() else "Loading image..."
+        self.deliver_result("load", future, self._finish_load, status=status)
+
+    # Step through the images in the current image's folder
+    def show_adjacent_image(self, step):
+        if self.folder_index is None:
+            self.application_message_label.config(text="Load an image to browse its folder.", fg='red')
             return
-        try:
-            self.load_image(path)
-            self.crop_image()
-            self.display_image(self._image, self.original_label)
-            self.display_image(self._resized_image, self.cropped_label, max_size=(300, 300))
-            self.application_message_label.config(text="Image loaded successfully.")
-        except Exception as e:
-            self.application_message_label.config(text=str(e), fg='red')
-
-    # Display an image in a given label, resizing it to fit max dimensions
-    def display_image(self, image, label, max_size=(500, 500)):
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        pil_img = Image.fromarray(image_rgb)
-        pil_img.thumbnail(max_size, Image.Resampling.LANCZOS)
-        tk_img = ImageTk.PhotoImage(pil_img)
+        index = self.folder_index + step
+        if 0 <= index < len(self.folder_paths):
+            self.folder_index = index  # Repeated presses keep stepping while a decode is in flight
+            self.open_path(self.folder_paths[index])
+
+    # Adopt a decoded image on the Tk thread
+    def _finish_load(self, loaded):
+        editor, display = loaded
+        self.cancel_background("resize")  # Results for the previous image are now stale
+        self._image = editor._image
+        self._source = editor._source
+        self._source_path, self._source_key = editor._source_path, editor._source_key
+        self._crop_rectangle = list(editor._crop_rectangle)  # The prefetched editor may be shown again
+        if self.exact_output is not None:
+            # Keep the exact size for the next image when it fits, centred like the default crop
+            full_h, full_w = self._source.shape if self.is_reduced else self._image.shape[:2]
+            if self.exact_output[0] <= full_w and self.exact_output[1] <= full_h:
+                h, w = self._image.shape[:2]
+                crop_w, crop_h = self.fixed_crop_size()
+                self._crop_rectangle = self.fixed_rectangle((w - crop_w) // 2, (h - crop_h) // 2)
+            else:
+                self.exact_output = None
+                self.resize_slider.configure(state="normal")
+        self.crop_image()
+        self.build_display_cache(display)
+        self.update_display()
+        self.history.clear()
+        self.record_edit()
+        self.update_folder(editor._source_path)
+        self.application_message_label.config(text="Image loaded successfully.", fg='green')
+
+    # Track the loaded image's position in its folder and prefetch its neighbours
+    def update_folder(self, path):
+        path = os.path.abspath(path)
+        if path not in self.folder_paths:
+            self.folder_paths = [os.path.abspath(p) for p in collect_batch_paths(os.path.dirname(path))]
+        if path not in self.folder_paths:
+            self.folder_index = None
+            return
+        index = self.folder_index = self.folder_paths.index(path)
+        # Nearest first, so the likely next image is decoded before the far ones
+        offsets = sorted(range(-self.prefetch_count, self.prefetch_count + 1), key=abs)[1:]
+        self.prefetcher.prefetch([self.folder_paths[index + offset] for offset in offsets
+                                  if 0 <= index + offset < len(self.folder_paths)])
+
+    # Push an already screen-sized RGB array to a label
+    @profiled("display.photoimage")
+    def show_rgb_image(self, image_rgb, label):
+        tk_img = ImageTk.PhotoImage(Image.fromarray(image_rgb))
         label.configure(image=tk_img)
         label.image = tk_img  # Keep reference to avoid garbage collection
 
-    # Refresh both the crop rectangle and cropped preview
+    # Convert and downsample an image into a screen-sized RGB preview; safe to call off the Tk thread
+    @staticmethod
+    def make_display_base(image, max_size=(500, 500), profiler=None):
+        h, w = image.shape[:2]
+        scale = min(max_size[0] / w, max_size[1] / h, 1.0)
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        start = time.perf_counter()
+        small = cv2.resize(image, size, interpolation=cv2.INTER_AREA) if size != (w, h) else image
+        resized = time.perf_counter()
+        rgb = ImageEditorApp.display_rgb(small)
+        if profiler is not None:
+            profiler.record("display.resize", resized - start)
+            profiler.record("display.convert", time.perf_counter() - resized)
+        return rgb, scale
+
+    # Tone-map a screen-sized image of any depth to 8-bit RGB: other depths are stretched to their
+    # own range, grey is expanded and alpha is not shown
+    @staticmethod
+    def display_rgb(image):
+        if image.ndim == 3 and image.shape[2] == 4:
+            image = np.ascontiguousarray(image[:, :, :3])
+        if image.dtype != np.uint8:
+            image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        if image.ndim == 2:
+            return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    # Render cache key for the screen-sized RGB preview of the crop at scale
+    def preview_key(self, scale, max_size=(300, 300)):
+        out_w, out_h = self.scaled_size(self._cropped_image, scale)
+        fit = min(max_size[0] / out_w, max_size[1] / out_h, 1.0)
+        size = (max(1, round(out_w * fit)), max(1, round(out_h * fit)))
+        return ("preview",) + self.render_key(scale, self.quality_interpolation(scale), size)
+
+    # Convert and downsample the source once per load into a screen-sized preview
+    def build_display_cache(self, display=None):
+        self._display_base, self._display_scale = display or self.make_display_base(self._image)
+        self._rendered_crop = None
+        self._rendered_scale = None
+        self.show_source_image()
+
+    # Blit the cached preview to the canvas once and create the overlay items on first use
+    def show_source_image(self):
+        canvas = self.original_canvas
+        tk_img = ImageTk.PhotoImage(Image.fromarray(self._display_base))
+        h, w = self._display_base.shape[:2]
+        canvas.config(width=w, height=h)
+        if self._canvas_image_item is None:
+            self._canvas_image_item = canvas.create_image(0, 0, anchor='nw', image=tk_img)
+            self._crop_overlay_items = [canvas.create_rectangle(0, 0, 0, 0, outline='#0000FF', width=2)]
+            self._crop_overlay_items += [canvas.create_rectangle(0, 0, 0, 0, fill='#01016F', outline='')
+                                         for _ in range(8)]
+        else:
+            canvas.itemconfig(self._canvas_image_item, image=tk_img)
+        canvas.image = tk_img  # Keep reference to avoid garbage collection
+
+    # Queue a render of the latest crop/scale state, at most once per frame
+    def schedule_render(self, scale=None):
+        if scale is not None:
+            self._pending_scale = scale
+        if self._render_job is not None:
+            self.dropped_render_events += 1
+            return
+        frame_interval = 1.0 / self.target_frame_rate
+        wait_time = frame_interval - (time.perf_counter() - self._last_render_time)
+        if wait_time <= 0:
+            self._render_job = self.root.after_idle(self._run_scheduled_render)
+        else:
+            self._render_job = self.root.after(max(1, int(wait_time * 1000)), self._run_scheduled_render)
+
+    # Render whatever state is current when the scheduled frame comes due
+    @profiled("render.frame")
+    def _run_scheduled_render(self):
+        self._render_job = None
+        self._last_render_time = time.perf_counter()
+        self.update_display()
+        if self._pending_scale is not None:
+            scale, self._pending_scale = self._pending_scale, None
+            self.render_resized_preview(scale)
+
+    # Refresh both the crop rectangle and cropped preview, only if the crop actually changed
     def update_display(self):
+        if self._display_base is None or tuple(self._crop_rectangle) == self._rendered_crop:
+            return
         self.draw_crop_rectangle()
         self.update_crop_preview()
+        self._rendered_crop = tuple(self._crop_rectangle)
 
-    # Draw the crop rectangle on the original image for visual feedback
+    # Move the crop rectangle overlay items for visual feedback; no image buffers are touched
+    @profiled("render.overlay")
     def draw_crop_rectangle(self):
-        preview = self._image.copy()
-        x1, y1, x2, y2 = self._crop_rectangle
-        # Draw crop rectangle
-        cv2.rectangle(preview, (x1, y1), (x2, y2), (255, 0, 0), 5)
+        canvas = self.original_canvas
+        x1, y1, x2, y2 = [v * self._display_scale for v in self._crop_rectangle]
+        frame_item, *node_items = self._crop_overlay_items
+        canvas.coords(frame_item, x1, y1, x2, y2)
+        self.handles.update(x1, y1, x2, y2)  # Hit testing is recomputed only when the rectangle changes
 
-        # Draw corner and side nodes
-        node_color = (111,1,1)
-        node_size = 15
-
-        # Corner nodes
-        for (cx, cy) in [(x1, y1), (x2, y1), (x1, y2), (x2, y2)]:
-            cv2.rectangle(preview, (cx - node_size, cy - node_size), (cx + node_size, cy + node_size), node_color, -1)
-
-        self.display_image(preview, self.original_label)
+        # Corner and edge handle nodes
+        node_size = 4
+        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+        for node_item, (cx, cy) in zip(node_items, [(x1, y1), (mx, y1), (x2, y1), (x1, my),
+                                                    (x2, my), (x1, y2), (mx, y2), (x2, y2)]):
+            canvas.coords(node_item, cx - node_size, cy - node_size, cx + node_size, cy + node_size)
 
     # Crop the selected region and show the resized version
+    @profiled("render.crop_preview")
     def update_crop_preview(self):
         x1, y1, x2, y2 = self._crop_rectangle
         self._cropped_image = self._image[y1:y2, x1:x2]
-        self._resized_image = self._cropped_image.copy()
-        self.display_image(self._resized_image, self.cropped_label, max_size=(300, 300))
-        h, w = self._cropped_image.shape[:2]
+        self._resized_image = self._cropped_image  # View, no copy
+        self._rendered_scale = None  # Preview now shows the unscaled crop
+        self.cancel_background("resize")
+        key = self.preview_key(100)
+        preview = self.render_cache.get(key)
+        if preview is None:
+            preview = self.make_display_base(self._cropped_image, max_size=(300, 300), profiler=self.profiler)[0]
+            self.render_cache.put(key, preview)
+        self.show_rgb_image(preview, self.cropped_label)
+        w, h = self.output_size(100)
         self.cropped_shape_label.config(text=f"Cropped Image: {w} × {h}")
 
-    # Convert mouse coordinates on label to image coordinates
+    # Convert mouse coordinates on the canvas to image coordinates
     def get_mouse_image_coords(self, event):
-        label_w = self.original_label.winfo_width()
-        label_h = self.original_label.winfo_height()
-        img_h, img_w = self._image.shape[:2]
-        scale_x = img_w / label_w
-        scale_y = img_h / label_h
-        return int(event.x * scale_x), int(event.y * scale_y)
-
-    # Handle cursor hovering over crop rectangle sides
+        return int(event.x / self._display_scale), int(event.y / self._display_scale)
+
+    # Handle under the mouse; in exact output mode the crop can only be moved
+    def handle_at(self, event):
+        handle = self.handles.hit(event.x, event.y)
+        return "move" if handle and self.exact_output is not None else handle
+
+    # Show a cursor for the handle under the mouse
     def on_mouse_move(self, event):
         if self._image is None:
             return
-        x, y = self.get_mouse_image_coords(event)
-        x1, y1, x2, y2 = self._crop_rectangle
-        margin = 10
-
-        self.hover_side = None
-        if abs(x - x1) < margin:
-            self.hover_side = 'left'
-            self.root.config(cursor='sb_h_double_arrow')
-        elif abs(x - x2) < margin:
-            self.hover_side = 'right'
-            self.root.config(cursor='sb_h_double_arrow')
-        elif abs(y - y1) < margin:
-            self.hover_side = 'top'
-            self.root.config(cursor='sb_v_double_arrow')
-        elif abs(y - y2) < margin:
-            self.hover_side = 'bottom'
-            self.root.config(cursor='sb_v_double_arrow')
-        elif abs(x - x1) < margin and abs(y - y1) < margin:
-            self.hover_side = 'topleft'
-            self.root.config(cursor='top_left_corner')
-        elif abs(x - x2) < margin and abs(y - y2) < margin:
-            self.hover_side = 'bottomright'
-            self.root.config(cursor='bottom_right_corner')
-        else:
-            self.root.config(cursor='arrow')
+        previous_side = self.hover_side
+        self.hover_side = self.handle_at(event)
 
-        self.update_display()
+        # Hovering never changes the image, so only touch the cursor when the hovered handle changes
+        if self.hover_side != previous_side:
+            self.root.config(cursor=CropHandles.CURSORS.get(self.hover_side, 'arrow'))
 
-    # Start resizing crop area on mouse click
+    # Start moving or resizing the crop area on mouse click
     def start_resize(self, event):
         if self._image is None:
             return
-        x, y = self.get_mouse_image_coords(event)
-        x1, y1, x2, y2 = self._crop_rectangle
-        margin = 10
-
-        # Determine which side or corner to resize
-        if abs(x - x1) < margin:
-            self.drag_mode = 'left'
-        elif abs(x - x2) < margin:
-            self.drag_mode = 'right'
-        elif abs(y - y1) < margin:
-            self.drag_mode = 'top'
-        elif abs(y - y2) < margin:
-            self.drag_mode = 'bottom'
-        elif abs(x - x1) < margin and abs(y - y1) < margin:
-            self.drag_mode = 'topleft'
-        elif abs(x - x2) < margin and abs(y - y2) < margin:
-            self.drag_mode = 'bottomright'
-        else:
-            self.drag_mode = None
+        self.drag_mode = self.handle_at(event)
+        self.drag_start = self.get_mouse_image_coords(event)
+        self.drag_origin = list(self._crop_rectangle)
 
-        self.drag_start = (x, y)
-
-    # Resize crop rectangle dynamically during mouse drag
+    # Resize crop rectangle dynamically during mouse drag, always from the rectangle the drag started with
     def do_resize(self, event):
         if self._image is None or not self.drag_mode:
             return
         x, y = self.get_mouse_image_coords(event)
-        dx, dy = x - self.drag_start[0], y - self.drag_start[1]
-        x1, y1, x2, y2 = self._crop_rectangle
-
-        # Adjust crop rectangle sides based on drag direction and mode
-        if 'left' in self.drag_mode:
-            x1 = max(0, min(x1 + dx, x2 - 10))
-        if 'right' in self.drag_mode:
-            x2 = min(self._image.shape[1], max(x2 + dx, x1 + 10))
-        if 'top' in self.drag_mode:
-            y1 = max(0, min(y1 + dy, y2 - 10))
-        if 'bottom' in self.drag_mode:
-            y2 = min(self._image.shape[0], max(y2 + dy, y1 + 10))
-
-        self._crop_rectangle = [x1, y1, x2, y2]
-        self.drag_start = (x, y)
-        self.update_display()
+        h, w = self._image.shape[:2]
+        self._crop_rectangle = drag_rectangle(self.drag_origin, self.drag_mode, x - self.drag_start[0],
+                                              y - self.drag_start[1], w, h, self.aspect_lock)
+        self.schedule_render()
 
     # End drag operation when mouse is released
     def end_resize(self, event):
+        if self.drag_mode:
+            self.record_edit()
         self.drag_mode = None
 
-    # Resize the cropped image using the value from the slider
+    # Slider callback: queue the new scale for the next frame instead of rendering immediately
     def ui_resize_image(self, value):
-        scale = int(value)
-        try:
-            img = self.resize_image(float(value))
-            if img is not None:
-                self.slider_label.configure(text=scale)
-                width = int(self._cropped_image.shape[1] * scale / 100)
-                height = int(self._cropped_image.shape[0] * scale / 100)
-                self.resized_shape_label.config(text=f"Resized Image: {width} × {height}")
-                self.display_image(img, self.cropped_label, max_size=(300, 300))
-                self.slider_label.config(text=f"{int(value)}%")
-        except Exception as e:
-            self.application_message_label.config(text=str(e), fg='red')
+        self.schedule_render(scale=value)
 
-    # Save the resized image using file dialog
+    # Show the slider value immediately with a cheap resize computed directly at preview size
+    def render_resized_preview(self, value):
+        if self._cropped_image is None or value == self._rendered_scale:
+            return
+        h, w = self._cropped_image.shape[:2]
+        out_w, out_h = int(w * value / 100), int(h * value / 100)
+        if out_w < 1 or out_h < 1:
+            self.application_message_label.config(text="Scale is too small to resize.", fg='red')
+            return
+        self._rendered_scale = value
+        fit = min(300 / out_w, 300 / out_h, 1.0)
+        preview_size = (max(1, int(out_w * fit)), max(1, int(out_h * fit)))
+        with self.timed("preview.fast_resize"):
+            preview = cv2.resize(self._cropped_image, preview_size, interpolation=self.preview_interpolation)
+        with self.timed("display.convert"):
+            preview = self.display_rgb(preview)
+        self.show_rgb_image(preview, self.cropped_label)
+        full_w, full_h = self.output_size(value)
+        self.resized_shape_label.config(text=f"Resized Image: {full_w} × {full_h}")
+        self.slider_label.config(text=f"{int(value)}%")
+
+        # Any full-resolution result in flight is for an older value; restart the settle timer
+        self.cancel_background("resize")
+        if self._settle_job is not None:
+            self.root.after_cancel(self._settle_job)
+        self._settle_job = self.root.after(self.settle_delay_ms, lambda: self.render_full_resolution(value))
+
+    # Slider has settled: compute the full-resolution quality resize on the background thread,
+    # unless this crop and scale are already in the render cache
+    def render_full_resolution(self, value):
+        self._settle_job = None
+        cropped = self._cropped_image
+        interpolation = self.quality_interpolation(value)
+        key = self.render_key(value, interpolation, self.scaled_size(cropped, value))
+        preview_key = self.preview_key(value)
+
+        # The result is kept in the render cache, so it gets its own array rather than a reused buffer
+        def work():
+            with self.timed("resize.full_quality"):
+                resized = self.scale_image(cropped, float(value), interpolation)
+            return resized, self.make_display_base(resized, max_size=(300, 300), profiler=self.profiler)[0]
+
+        def done(result):
+            resized, preview = result
+            self._resized_image = resized
+            self._scale = value
+            self.show_rgb_image(preview, self.cropped_label)
+            self.render_cache.put(key, resized)
+            self.render_cache.put(preview_key, preview)
+            self.record_edit()
+            self.application_message_label.config(text="")
+
+        resized, preview = self.render_cache.get(key), self.render_cache.get(preview_key)
+        if resized is not None and preview is not None:
+            self.cancel_background("resize")
+            done((resized, preview))
+            return
+        self.run_in_background("resize", work, done, status=f"Rendering {int(value)}% at full quality...")
+
+    # Save the resized image using file dialog, encoding on the background thread
     def ui_save_image(self):
         if self._resized_image is None:
             self.application_message_label.config(text="Oops! No image to save.", fg='red')
             return
         path = filedialog.asksaveasfilename(defaultextension=".png",
-                                            filetypes=[("PNG Files", "*.png"), ("JPEG Files", "*.jpg *.jpeg")])
+                                            filetypes=[("PNG Files", "*.png"), ("JPEG Files", "*.jpg *.jpeg"),
+                                                       ("TIFF Files", "*.tif *.tiff"),
+                                                       ("Streamed large output", "*.ppm *.bmp *.npy")])
         if not path:
             return
-        try:
-            self.save_image(path)
+
+        # If the slider has not settled yet, render the quality result as part of the save.
+        # A quality resize still in flight is the result the user asked for; the single worker runs it first.
+        image = self._resized_image
+        cropped = self._cropped_image
+        pending_resize = self._task_futures.get("resize")
+        settle_scale = None
+        if self._settle_job is not None:
+            self.root.after_cancel(self._settle_job)
+            self._settle_job = None
+            settle_scale = self._rendered_scale
+
+        # A reduced proxy is re-rendered from the full-resolution region instead
+        reduced, source, rectangle = self.is_reduced, self._source, self.full_resolution_rectangle()
+        scale = self._rendered_scale if self._rendered_scale is not None else 100
+
+        def work():
+            if reduced:
+                self.save_full_resolution(source, rectangle, float(scale), path)
+                return None
+            result = image
+            if settle_scale is not None:
+                with self.timed("resize.full_quality"):
+                    result = self.scale_image(cropped, float(settle_scale), self.quality_interpolation(settle_scale))
+            elif pending_resize is not None and not pending_resize.cancelled():
+                result = pending_resize.result()[0]
+            with self.timed("save.encode"):
+                self.write_image(path, result)
+            return result
+
+        def done(result):
+            if result is not None and cropped is self._cropped_image:
+                self._resized_image = result
             self.application_message_label.config(text=f"Image saved to {path}", fg='green')
-        except Exception as e:
-            self.application_message_label.config(text=str(e), fg='red')
 
-# Launch the GUI application
-if __name__ == "__main__":
+        self.run_in_background("save", work, done, status=f"Saving to {path}...")
+
+# Launch the GUI application, or run headlessly when --batch is given
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Image crop and resize editor")
+    parser.add_argument("--batch", metavar="SOURCE", help="directory or manifest of images to process without the GUI")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="CSV or JSON lines of path,x1,y1,x2,y2,scale,output to crop without the GUI")
+    parser.add_argument("--output", default="output", help="directory for batch results")
+    parser.add_argument("--crop", metavar="X1,Y1,X2,Y2", type=parse_crop_spec,
+                        help="crop rectangle x1,y1,x2,y2 (default: centred half-size box)")
+    parser.add_argument("--auto-crop", metavar="ASPECT[@SIZE]", type=parse_auto_crop_spec,
+                        help="crop the most salient region, e.g. 16:9, 1:1@0.8 or image@0.5; overrides --crop")
+    parser.add_argument("--scale", type=float, default=100, help="resize percentage")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--max-in-flight", type=int, help="maximum queued jobs (default: 2 x workers)")
+    parser.add_argument("--track-memory", action="store_true", help="report peak memory per operation")
+    parser.add_argument("--profile", metavar="FILE", help="write batch stage latency percentiles as JSON or CSV")
+    parser.add_argument("--export", action="append", metavar="SPEC", type=parse_export_spec,
+                        help="extra output written next to the main one, as format[:setting=value,...][@scale], "
+                             "e.g. jpg:quality=85@50; repeatable")
+    parser.add_argument("--render-cache", metavar="DIR", help="directory for a disk cache of resized crops")
+    parser.add_argument("--render-cache-mb", type=float, default=1024,
+                        help="size limit of the --render-cache directory in MiB, shared by all workers")
+    parser.add_argument("--preserve-depth", action="store_true",
+                        help="keep 16-bit/float samples and alpha; fails on formats that cannot store them")
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        if not os.path.isfile(args.manifest):
+            parser.error(f"manifest not found: {args.manifest}")
+        return run_manifest_cli(args)
+    if args.batch:
+        if not os.path.exists(args.batch):
+            parser.error(f"batch source not found: {args.batch}")
+        return run_batch_cli(args)
+    if customtkinter is None:
+        parser.error("the GUI needs tkinter and customtkinter installed; use --batch to run headless")
+
     root = Tk()
     root.minsize(width=600, height=450)
     app = ImageEditorApp(root)
     root.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,22 @@
 # Initialize Pygame library modules to prepare for rendering graphics, managing events, and handling media
+import argparse
 import pygame
 import sys
 import random
+import time
+from collections import namedtuple
 
 pygame.init()
 
 # Set fixed dimensions for the main game window, ensuring a consistent rendering resolution across devices
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Side-Scrolling Game")
+SCREEN = None  # Created by init_display(); the simulation itself never needs a window
+
+# Fixed simulation timestep: speeds, gravity and timers are all expressed per frame at 60 FPS
+FPS = 60
+STEP_SECONDS = 1 / FPS
+MAX_FRAME_SECONDS = 0.25  # Cap on real time fed to the simulation after a stall, so it never spirals
 
 # Define RGB tuples representing a diverse color palette used for character rendering and UI elements
 WHITE = (255, 255, 255)      # Used for backgrounds or neutral UI elements
@@ -31,16 +38,118 @@ GAME_OVER = 2           # Triggered when player loses all lives or fails the mis
 GAME_WON = 3            # A final win condition where objectives are successfully met
 LEVEL_COMPLETED = 4     # Transitional state between levels for feedback or story advancement
 
-# Initialize key global variables to track progression, state management, and level configurations
-game_state = MENU                 # Current execution state of the game loop
-score = 0                         # Accumulative metric tracking the player’s in-game success
-current_level_index = 0          # Determines which level data is currently being rendered
-level_data = []                  # Placeholder for level-specific configuration and platform data
+# Number of levels built by build_level(), used for progression checks
+LEVEL_COUNT = 3
+
+# Side length in pixels of one spatial hash cell; a little larger than the biggest moving sprite
+GRID_CELL_SIZE = 128
+
+# Projectiles preallocated per player, and the cap on how many may be in flight at once
+PROJECTILE_POOL_SIZE = 16
+MAX_LIVE_PROJECTILES = 32
+
+# Player input for one simulation step: held movement keys plus one-shot jump/shoot presses
+FrameInput = namedtuple("FrameInput", "left right jump shoot", defaults=(False, False, False, False))
+NO_INPUT = FrameInput()
+
+# Fonts are loaded by init_display() together with the window, since only rendering uses them
+font = None         # Default small text (e.g., score, labels)
+medium_font = None  # Medium emphasis text (e.g., menus, subtitles)
+large_font = None   # Primary headers or alerts (e.g., "Game Over")
+
+
+# Open the game window and load fonts; called only by the interactive game, never by headless runs
+def init_display():
+    global SCREEN, font, medium_font, large_font
+    if SCREEN is None:
+        SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Side-Scrolling Game")
+        font = pygame.font.Font(None, 36)
+        medium_font = pygame.font.Font(None, 48)
+        large_font = pygame.font.Font(None, 72)
+        warm_sprite_cache()
+    return SCREEN
+
+
+# Pre-rendered character art shared by every sprite, keyed by (character kind, size, color). Each
+# variant is drawn once; once a window exists it is also converted to the display's pixel format
+SPRITE_CACHE = {}
+
+def character_sprite(character, color):
+    key = (type(character).__name__, (character.width, character.height), color)
+    image = SPRITE_CACHE.get(key)
+    if image is None:
+        image = pygame.Surface(key[1], pygame.SRCALPHA)
+        character.draw_character(image, color)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        SPRITE_CACHE[key] = image
+    return image
+
+def projectile_sprite(radius, color):
+    key = ("Projectile", (radius * 2, radius * 2), color)
+    image = SPRITE_CACHE.get(key)
+    if image is None:
+        image = pygame.Surface(key[1], pygame.SRCALPHA)
+        pygame.draw.circle(image, color, (radius, radius), radius)
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        SPRITE_CACHE[key] = image
+    return image
+
+# Render every character variant up front, so no art is drawn during play. Called after the window
+# opens, which drops any unconverted variants made earlier by headless code
+def warm_sprite_cache():
+    SPRITE_CACHE.clear()
+    Player(0, 0)
+    Enemy(0, 0)
+    Enemy(0, 0, "boss")
+    projectile_sprite(Projectile.radius, Projectile.color)
+
+# Uniform-grid spatial index used for every collision query. Each named layer maps grid cells to the
+# sprites overlapping them: static layers (platforms, collectibles) are filled once per level, dynamic
+# ones (enemies) are rebuilt every step. Queries only test sprites in the cells a rect touches, and
+# return them in insertion order so collision resolution matches iterating the sprite group
+class SpatialHash:
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.layers = {}  # layer name -> {(cell_x, cell_y): [(insertion index, sprite), ...]}
+        self.counts = {}  # layer name -> number of sprites inserted, used as the next insertion index
+
+    # Grid cells covered by a rect, as (cell_x, cell_y) keys
+    def cell_keys(self, rect):
+        size = self.cell_size
+        x_cells = range(int(rect.left // size), int((rect.right - 1) // size) + 1)
+        y_cells = range(int(rect.top // size), int((rect.bottom - 1) // size) + 1)
+        return [(x, y) for x in x_cells for y in y_cells]
+
+    def insert(self, layer, sprite):
+        cells = self.layers.setdefault(layer, {})
+        index = self.counts.get(layer, 0)
+        self.counts[layer] = index + 1
+        for key in self.cell_keys(sprite.rect):
+            cells.setdefault(key, []).append((index, sprite))
+
+    # Replace a layer's contents, re-bucketing sprites at their current positions
+    def rebuild(self, layer, sprites):
+        self.layers[layer] = {}
+        self.counts[layer] = 0
+        for sprite in sprites:
+            self.insert(layer, sprite)
+
+    # Live sprites in a layer whose rects overlap the given rect. Killed sprites are skipped,
+    # so static layers need no removal when a collectible is picked up
+    def query(self, layer, rect):
+        cells = self.layers.get(layer)
+        if not cells:
+            return []
+        found = {}
+        for key in self.cell_keys(rect):
+            for index, sprite in cells.get(key, ()):
+                if rect.colliderect(sprite.rect) and index not in found and sprite.alive():
+                    found[index] = sprite
+        return [found[index] for index in sorted(found)]
 
-# Load font resources from system with fallback to default if unavailable, used for HUD and game messages
-font = pygame.font.Font(None, 36)        # Default small text (e.g., score, labels)
-medium_font = pygame.font.Font(None, 48) # Medium emphasis text (e.g., menus, subtitles)
-large_font = pygame.font.Font(None, 72)  # Primary headers or alerts (e.g., "Game Over")
 
 # Define the Player class inheriting from pygame's Sprite to leverage built-in collision and grouping features
 class Player(pygame.sprite.Sprite):
@@ -48,8 +157,8 @@ class Player(pygame.sprite.Sprite):
         super().__init__()
         self.width = 40
         self.height = 60
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)  # Create a transparent image for drawing
-        self.draw_character(self.image, BLUE)  # Render the visual representation of the character
+        self.image = character_sprite(self, BLUE)  # Shared pre-rendered art for the character
+        self.flash_image = character_sprite(self, RED)  # Red silhouette shown while invincible
         self.rect = self.image.get_rect(topleft=(x, y))  # Define collision box positioned at (x, y)
 
         # Movement and physics-related properties
@@ -67,7 +176,9 @@ class Player(pygame.sprite.Sprite):
         self.direction = 1
 
         # Container for projectiles instantiated by the player, allowing centralized update/render management
-        self.projectiles = pygame.sprite.Group()
+        self.projectiles = pygame.sprite.RenderUpdates()
+        # Recycles projectiles so rapid fire does not allocate a sprite per shot
+        self.projectile_pool = ProjectilePool()
 
         # Timer for temporary invincibility (e.g., after taking damage) to prevent immediate re-hits
         self.invincible_timer = 0
@@ -144,13 +255,13 @@ class Player(pygame.sprite.Sprite):
         pygame.draw.circle(surface, BLACK, (head_center_x + head_radius // 2, head_center_y - head_radius // 4), 2)
         pygame.draw.line(surface, BLACK, (head_center_x - head_radius // 3, head_center_y + head_radius // 4), (head_center_x + head_radius // 3, head_center_y + head_radius // 4), 1)
 
-    def update(self, platforms):
+    def update(self, grid):
         # Apply gravity-like acceleration to simulate falling
         self.y_velocity += 0.7
         self.rect.y += self.y_velocity
 
-        # Collision detection and resolution with platforms (only in vertical direction)
-        for platform in platforms:
+        # Collision detection and resolution with nearby platforms from the grid (only in vertical direction)
+        for platform in grid.query("platforms", self.rect):
             if self.rect.colliderect(platform.rect):
                 if self.y_velocity > 0:  # Downward collision (landing)
                     self.rect.bottom = platform.rect.top
@@ -187,9 +298,10 @@ class Player(pygame.sprite.Sprite):
             self.is_jumping = True
 
     def shoot(self):
-        # Create a new projectile
-        projectile = Projectile(self.rect.centerx, self.rect.centery - 10, self.direction)
-        self.projectiles.add(projectile)
+        # Take a projectile from the pool; the shot is dropped when too many are already in flight
+        projectile = self.projectile_pool.acquire(self.rect.centerx, self.rect.centery - 10, self.direction)
+        if projectile is not None:
+            self.projectiles.add(projectile)
 
     def take_damage(self, damage):
         if self.invincible_timer == 0:
@@ -203,53 +315,104 @@ class Player(pygame.sprite.Sprite):
                     return True # Player is dead
         return False # Player is not dead
 
-def draw(self, screen):
-    # If the player is currently invincible, create a flashing effect by rendering a red silhouette every alternate frame
-    if self.invincible_timer > 0 and (self.invincible_timer // 10) % 2 == 0:
-        # Create a transparent surface the same size as the player for the flashing effect
-        flashing_image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        # Draw the character using RED to indicate invincibility
-        self.draw_character(flashing_image, RED)
-        # Blit the flashing (red) image to the screen at the player's position
-        screen.blit(flashing_image, self.rect)
-    else:
-        # If not invincible (or not in flashing frame), draw the normal character sprite
-        screen.blit(self.image, self.rect)
+    # Draw the player, health bar and projectiles; returns the screen rects that were drawn
+    def draw(self, screen):
+        # If the player is currently invincible, create a flashing effect by rendering a red silhouette every alternate frame
+        if self.invincible_timer > 0 and (self.invincible_timer // 10) % 2 == 0:
+            # Blit the cached red silhouette at the player's position to indicate invincibility
+            body_rect = screen.blit(self.flash_image, self.rect)
+        else:
+            # If not invincible (or not in flashing frame), draw the normal character sprite
+            body_rect = screen.blit(self.image, self.rect)
     
-    # -------- Draw Health Bar --------
-    health_bar_width = self.rect.width  # Full width matches the character's width
-    health_bar_height = 5               # Fixed height of health bar
-    health_bar_x = self.rect.x          # Align health bar horizontally with character
-    health_bar_y = self.rect.y - 10     # Position slightly above the character
+        # -------- Draw Health Bar --------
+        health_bar_width = self.rect.width  # Full width matches the character's width
+        health_bar_height = 5               # Fixed height of health bar
+        health_bar_x = self.rect.x          # Align health bar horizontally with character
+        health_bar_y = self.rect.y - 10     # Position slightly above the character
 
-    # Draw the red background (total health)
-    pygame.draw.rect(screen, RED, (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
+        # Draw the red background (total health)
+        bar_rect = pygame.draw.rect(screen, RED, (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
 
-    # Calculate and draw the green foreground (current health proportion)
-    current_health_width = (self.health / self.max_health) * health_bar_width
-    pygame.draw.rect(screen, GREEN, (health_bar_x, health_bar_y, current_health_width, health_bar_height))
+        # Calculate and draw the green foreground (current health proportion)
+        current_health_width = (self.health / self.max_health) * health_bar_width
+        pygame.draw.rect(screen, GREEN, (health_bar_x, health_bar_y, current_health_width, health_bar_height))
 
-    # -------- Draw Player's Projectiles --------
-    # Draw all active projectiles currently held in the player's projectile group
-    self.projectiles.draw(screen)
+        # -------- Draw Player's Projectiles --------
+        # Draw all active projectiles currently held in the player's projectile group
+        return [body_rect, bar_rect] + self.projectiles.draw(screen)
 
 
+# Pooled projectile: instances are created by a ProjectilePool, re-aimed with launch() and handed
+# back to their pool when killed. All of them share one cached image
 class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction):
+    __slots__ = ("image", "rect", "speed", "damage", "pool", "active")
+    radius = 5
+    color = YELLOW
+
+    def __init__(self, pool=None):
         super().__init__()
-        self.radius = 5
-        self.color = YELLOW
-        self.image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, self.color, (self.radius, self.radius), self.radius)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.speed = 10 * direction
+        self.image = projectile_sprite(self.radius, self.color)
+        self.rect = self.image.get_rect()
+        self.speed = 0
         self.damage = 10
+        self.pool = pool
+        self.active = False
+
+    # Place the projectile at (x, y) travelling in the given direction
+    def launch(self, x, y, direction):
+        self.rect.center = (x, y)
+        self.speed = 10 * direction
+        self.active = True
 
     def update(self):
         self.rect.x += self.speed
         if self.rect.right < 0 or self.rect.left > SCREEN_WIDTH:
             self.kill()
 
+    # Remove from all groups and return to the pool; a projectile hitting two enemies is killed
+    # twice in one step, so only the first kill releases it
+    def kill(self):
+        super().kill()
+        if self.active:
+            self.active = False
+            if self.pool is not None:
+                self.pool.release(self)
+
+
+# Free list of Projectile sprites. hits counts shots served from the free list, misses counts shots
+# that had to allocate a new projectile, and dropped counts shots refused at the max_live cap
+class ProjectilePool:
+    def __init__(self, size=PROJECTILE_POOL_SIZE, max_live=MAX_LIVE_PROJECTILES):
+        self.free = [Projectile(self) for _ in range(size)]
+        self.max_live = max_live
+        self.live = 0
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+
+    def acquire(self, x, y, direction):
+        if self.live >= self.max_live:
+            self.dropped += 1
+            return None
+        if self.free:
+            projectile = self.free.pop()
+            self.hits += 1
+        else:
+            projectile = Projectile(self)
+            self.misses += 1
+        projectile.launch(x, y, direction)
+        self.live += 1
+        return projectile
+
+    def release(self, projectile):
+        self.live -= 1
+        self.free.append(projectile)
+
+    def stats(self):
+        return {"live": self.live, "free": len(self.free), "hits": self.hits,
+                "misses": self.misses, "dropped": self.dropped}
+
 
 # Class for the enemy in the game.
 class Enemy(pygame.sprite.Sprite):
@@ -273,9 +436,8 @@ class Enemy(pygame.sprite.Sprite):
             self.damage = 40              # Boss deals more damage
             self.color = PURPLE           # Body color for boss enemy
         
-        # Create a transparent surface and draw the enemy character onto it
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        self.draw_character(self.image, self.color)
+        # Use the shared pre-rendered art for this enemy type
+        self.image = character_sprite(self, self.color)
 
         # Set the enemy’s position using a rect (for collision and positioning)
         self.rect = self.image.get_rect(topleft=(x, y))
@@ -287,145 +449,145 @@ class Enemy(pygame.sprite.Sprite):
         self.direction = 1
 
         
-def draw_character(self, surface, body_color):
-    """Draws a human-like enemy onto the given surface with more detail."""
+    def draw_character(self, surface, body_color):
+        """Draws a human-like enemy onto the given surface with more detail."""
     
-    # Clear the surface with full transparency
-    surface.fill((0, 0, 0, 0))
-
-    # === HEAD ===
-    head_radius = self.width // 3
-    head_center_x = self.width // 2
-    head_center_y = head_radius + 2
-    # Draw the enemy's head as a gray circle
-    pygame.draw.circle(surface, GRAY, (head_center_x, head_center_y), head_radius)
-
-    # === NECK ===
-    neck_width = self.width * 0.2
-    neck_height = self.height * 0.05
-    neck_x = (self.width - neck_width) // 2
-    neck_y = head_center_y + head_radius - 2
-    # Draw the neck as a small gray rectangle below the head
-    pygame.draw.rect(surface, GRAY, (neck_x, neck_y, neck_width, neck_height))
-
-    # === TORSO ===
-    torso_width = self.width * 0.7
-    torso_height = self.height * 0.3
-    torso_x = (self.width - torso_width) // 2
-    torso_y = neck_y + neck_height
-    # Draw the torso with the enemy's body color
-    pygame.draw.rect(surface, body_color, (torso_x, torso_y, torso_width, torso_height))
-
-    # === ARMS ===
-    arm_width = self.width * 0.15
-    arm_height = self.height * 0.3
-    arm_y = torso_y + 5
-    # Left arm
-    pygame.draw.rect(surface, body_color, (torso_x - arm_width, arm_y, arm_width, arm_height))
-    # Right arm
-    pygame.draw.rect(surface, body_color, (torso_x + torso_width, arm_y, arm_width, arm_height))
-
-    # === HANDS ===
-    hand_radius = 4
-    # Left hand as a small gray circle
-    pygame.draw.circle(surface, GRAY, (torso_x - arm_width + arm_width // 2, arm_y + arm_height), hand_radius)
-    # Right hand
-    pygame.draw.circle(surface, GRAY, (torso_x + torso_width + arm_width // 2, arm_y + arm_height), hand_radius)
-
-    # === PELVIS / HIPS ===
-    pelvis_width = self.width * 0.8
-    pelvis_height = self.height * 0.1
-    pelvis_x = (self.width - pelvis_width) // 2
-    pelvis_y = torso_y + torso_height
-    # Draw pelvis below the torso
-    pygame.draw.rect(surface, body_color, (pelvis_x, pelvis_y, pelvis_width, pelvis_height))
-
-    # === LEGS ===
-    leg_segment_width = pelvis_width // 2 - 4
-    leg_segment_height = self.height * 0.2
-    thigh_y = pelvis_y + pelvis_height
-    shin_y = thigh_y + leg_segment_height
-
-    # Left thigh
-    pygame.draw.rect(surface, body_color, (pelvis_x, thigh_y, leg_segment_width, leg_segment_height))
-    # Right thigh
-    pygame.draw.rect(surface, body_color, (pelvis_x + pelvis_width - leg_segment_width, thigh_y, leg_segment_width, leg_segment_height))
-
-    # Left shin
-    pygame.draw.rect(surface, body_color, (pelvis_x, shin_y, leg_segment_width, leg_segment_height))
-    # Right shin
-    pygame.draw.rect(surface, body_color, (pelvis_x + pelvis_width - leg_segment_width, shin_y, leg_segment_width, leg_segment_height))
-
-    # === FEET ===
-    foot_width = leg_segment_width + 2
-    foot_height = 5
-    foot_y = shin_y + leg_segment_height
-    # Left foot in black
-    pygame.draw.rect(surface, BLACK, (pelvis_x, foot_y, foot_width, foot_height))
-    # Right foot in black
-    pygame.draw.rect(surface, BLACK, (pelvis_x + pelvis_width - foot_width, foot_y, foot_width, foot_height))
-
-    # === FACE ===
-    # Draw a frowning expression: angry eyes
-    pygame.draw.line(surface, BLACK, 
-                     (head_center_x - head_radius // 3, head_center_y - head_radius // 4), 
-                     (head_center_x + head_radius // 3, head_center_y - head_radius // 4), 2)
-    # Simple mouth line
-    pygame.draw.line(surface, BLACK, 
-                     (head_center_x - head_radius // 3, head_center_y + head_radius // 4), 
-                     (head_center_x + head_radius // 3, head_center_y + head_radius // 4), 1)
-
-
-def update(self, platforms):
-    # Move enemy horizontally based on its speed and direction
-    self.rect.x += self.speed * self.direction
-
-    # Reverse direction if the enemy hits the screen edges
-    if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
-        self.direction *= -1  # Flip direction
-        self.rect.x += self.speed * self.direction * 2  # Push slightly away from the edge to avoid sticking
-
-    # Simulate gravity by moving the enemy down slightly
-    self.rect.y += 2
-
-    # Collision detection with platforms
-    for platform in platforms:
-        if self.rect.colliderect(platform.rect):
-            # If falling from above, snap the enemy to stand on the platform
-            if self.rect.bottom > platform.rect.top and self.rect.top < platform.rect.top:
-                self.rect.bottom = platform.rect.top
-
-    # If the enemy falls off the screen (below screen height), remove it from the game
-    if self.rect.top > SCREEN_HEIGHT:
-        self.kill()
-
-
-def take_damage(self, damage):
-    # Reduce enemy's health by the specified damage amount
-    self.health -= damage
-
-    # Return True if enemy is defeated
-    if self.health <= 0:
-        return True
-    return False
-
-
-def draw(self, screen):
-    # Draw the enemy's sprite on the screen
-    screen.blit(self.image, self.rect)
-
-    # === HEALTH BAR ===
-    health_bar_width = self.rect.width
-    health_bar_height = 5
-    health_bar_x = self.rect.x
-    health_bar_y = self.rect.y - 10  # Slightly above the enemy sprite
-
-    # Draw red background for total health
-    pygame.draw.rect(screen, RED, (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
-
-    # Draw green foreground proportional to current health
-    current_health_width = (self.health / self.max_health) * health_bar_width
-    pygame.draw.rect(screen, GREEN, (health_bar_x, health_bar_y, current_health_width, health_bar_height))
+        # Clear the surface with full transparency
+        surface.fill((0, 0, 0, 0))
+
+        # === HEAD ===
+        head_radius = self.width // 3
+        head_center_x = self.width // 2
+        head_center_y = head_radius + 2
+        # Draw the enemy's head as a gray circle
+        pygame.draw.circle(surface, GRAY, (head_center_x, head_center_y), head_radius)
+
+        # === NECK ===
+        neck_width = self.width * 0.2
+        neck_height = self.height * 0.05
+        neck_x = (self.width - neck_width) // 2
+        neck_y = head_center_y + head_radius - 2
+        # Draw the neck as a small gray rectangle below the head
+        pygame.draw.rect(surface, GRAY, (neck_x, neck_y, neck_width, neck_height))
+
+        # === TORSO ===
+        torso_width = self.width * 0.7
+        torso_height = self.height * 0.3
+        torso_x = (self.width - torso_width) // 2
+        torso_y = neck_y + neck_height
+        # Draw the torso with the enemy's body color
+        pygame.draw.rect(surface, body_color, (torso_x, torso_y, torso_width, torso_height))
+
+        # === ARMS ===
+        arm_width = self.width * 0.15
+        arm_height = self.height * 0.3
+        arm_y = torso_y + 5
+        # Left arm
+        pygame.draw.rect(surface, body_color, (torso_x - arm_width, arm_y, arm_width, arm_height))
+        # Right arm
+        pygame.draw.rect(surface, body_color, (torso_x + torso_width, arm_y, arm_width, arm_height))
+
+        # === HANDS ===
+        hand_radius = 4
+        # Left hand as a small gray circle
+        pygame.draw.circle(surface, GRAY, (torso_x - arm_width + arm_width // 2, arm_y + arm_height), hand_radius)
+        # Right hand
+        pygame.draw.circle(surface, GRAY, (torso_x + torso_width + arm_width // 2, arm_y + arm_height), hand_radius)
+
+        # === PELVIS / HIPS ===
+        pelvis_width = self.width * 0.8
+        pelvis_height = self.height * 0.1
+        pelvis_x = (self.width - pelvis_width) // 2
+        pelvis_y = torso_y + torso_height
+        # Draw pelvis below the torso
+        pygame.draw.rect(surface, body_color, (pelvis_x, pelvis_y, pelvis_width, pelvis_height))
+
+        # === LEGS ===
+        leg_segment_width = pelvis_width // 2 - 4
+        leg_segment_height = self.height * 0.2
+        thigh_y = pelvis_y + pelvis_height
+        shin_y = thigh_y + leg_segment_height
+
+        # Left thigh
+        pygame.draw.rect(surface, body_color, (pelvis_x, thigh_y, leg_segment_width, leg_segment_height))
+        # Right thigh
+        pygame.draw.rect(surface, body_color, (pelvis_x + pelvis_width - leg_segment_width, thigh_y, leg_segment_width, leg_segment_height))
+
+        # Left shin
+        pygame.draw.rect(surface, body_color, (pelvis_x, shin_y, leg_segment_width, leg_segment_height))
+        # Right shin
+        pygame.draw.rect(surface, body_color, (pelvis_x + pelvis_width - leg_segment_width, shin_y, leg_segment_width, leg_segment_height))
+
+        # === FEET ===
+        foot_width = leg_segment_width + 2
+        foot_height = 5
+        foot_y = shin_y + leg_segment_height
+        # Left foot in black
+        pygame.draw.rect(surface, BLACK, (pelvis_x, foot_y, foot_width, foot_height))
+        # Right foot in black
+        pygame.draw.rect(surface, BLACK, (pelvis_x + pelvis_width - foot_width, foot_y, foot_width, foot_height))
+
+        # === FACE ===
+        # Draw a frowning expression: angry eyes
+        pygame.draw.line(surface, BLACK, 
+                         (head_center_x - head_radius // 3, head_center_y - head_radius // 4), 
+                         (head_center_x + head_radius // 3, head_center_y - head_radius // 4), 2)
+        # Simple mouth line
+        pygame.draw.line(surface, BLACK, 
+                         (head_center_x - head_radius // 3, head_center_y + head_radius // 4), 
+                         (head_center_x + head_radius // 3, head_center_y + head_radius // 4), 1)
+
+
+    def update(self, grid):
+        # Move enemy horizontally based on its speed and direction
+        self.rect.x += self.speed * self.direction
+
+        # Reverse direction if the enemy hits the screen edges
+        if self.rect.left < 0 or self.rect.right > SCREEN_WIDTH:
+            self.direction *= -1  # Flip direction
+            self.rect.x += self.speed * self.direction * 2  # Push slightly away from the edge to avoid sticking
+
+        # Simulate gravity by moving the enemy down slightly
+        self.rect.y += 2
+
+        # Collision detection with nearby platforms from the grid
+        for platform in grid.query("platforms", self.rect):
+            if self.rect.colliderect(platform.rect):
+                # If falling from above, snap the enemy to stand on the platform
+                if self.rect.bottom > platform.rect.top and self.rect.top < platform.rect.top:
+                    self.rect.bottom = platform.rect.top
+
+        # If the enemy falls off the screen (below screen height), remove it from the game
+        if self.rect.top > SCREEN_HEIGHT:
+            self.kill()
+
+
+    def take_damage(self, damage):
+        # Reduce enemy's health by the specified damage amount
+        self.health -= damage
+
+        # Return True if enemy is defeated
+        if self.health <= 0:
+            return True
+        return False
+
+
+    def draw(self, screen):
+        # Draw the enemy's sprite on the screen
+        screen.blit(self.image, self.rect)
+
+        # === HEALTH BAR ===
+        health_bar_width = self.rect.width
+        health_bar_height = 5
+        health_bar_x = self.rect.x
+        health_bar_y = self.rect.y - 10  # Slightly above the enemy sprite
+
+        # Draw red background for total health
+        pygame.draw.rect(screen, RED, (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
+
+        # Draw green foreground proportional to current health
+        current_health_width = (self.health / self.max_health) * health_bar_width
+        pygame.draw.rect(screen, GREEN, (health_bar_x, health_bar_y, current_health_width, health_bar_height))
 
 
 # Class for collectible items (health boost, extra life, score boost)
@@ -468,53 +630,56 @@ class Platform(pygame.sprite.Sprite):
         # Position the platform on the screen
         self.rect = self.image.get_rect(topleft=(x, y))
 
-# Level configurations containing platforms, enemies, collectibles, and optional boss
-level_data = [
-    # Level 1
-    {
-        "platforms": [
-            Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40),  # Ground platform
-            Platform(150, SCREEN_HEIGHT - 150, 200, 20),
-            Platform(450, SCREEN_HEIGHT - 250, 150, 20),
-            Platform(0, SCREEN_HEIGHT - 350, 100, 20),
-            Platform(600, SCREEN_HEIGHT - 400, 200, 20),
-        ],
-        "enemies": [
-            Enemy(200, SCREEN_HEIGHT - 90),    # Patrols on ground
-            Enemy(500, SCREEN_HEIGHT - 300),   # Patrols on middle platform
-        ],
-        "collectibles": [
-            Collectible(100, SCREEN_HEIGHT - 70, "health_boost"),
-            Collectible(500, SCREEN_HEIGHT - 70, "score_boost"),
-        ],
-        "boss": None  # No boss in Level 1
-    },
 
-    # Level 2
-    {
-        "platforms": [
-            Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40),  # Ground platform
-            Platform(100, SCREEN_HEIGHT - 120, 150, 20),
-            Platform(300, SCREEN_HEIGHT - 200, 200, 20),
-            Platform(550, SCREEN_HEIGHT - 120, 150, 20),
-            Platform(200, SCREEN_HEIGHT - 300, 100, 20),
-            Platform(400, SCREEN_HEIGHT - 400, 150, 20),
-        ],
-        "enemies": [
-            Enemy(150, SCREEN_HEIGHT - 170),
-            Enemy(400, SCREEN_HEIGHT - 250),
-            Enemy(600, SCREEN_HEIGHT - 170),
-        ],
-        "collectibles": [
-            Collectible(200, SCREEN_HEIGHT - 70, "score_boost"),
-            Collectible(600, SCREEN_HEIGHT - 70, "health_boost"),
-            Collectible(450, SCREEN_HEIGHT - 450, "extra_life"),
-        ],
-        "boss": None  # No boss in Level 2
-    },
 
+# Build fresh sprites for one level (platforms, enemies, collectibles and optional boss), so that
+# restarts and parallel simulations never share or reuse sprite objects damaged in an earlier run
+def build_level(level_idx):
+    if level_idx == 0:
+        # Level 1
+        return {
+            "platforms": [
+                Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40),  # Ground platform
+                Platform(150, SCREEN_HEIGHT - 150, 200, 20),
+                Platform(450, SCREEN_HEIGHT - 250, 150, 20),
+                Platform(0, SCREEN_HEIGHT - 350, 100, 20),
+                Platform(600, SCREEN_HEIGHT - 400, 200, 20),
+            ],
+            "enemies": [
+                Enemy(200, SCREEN_HEIGHT - 90),    # Patrols on ground
+                Enemy(500, SCREEN_HEIGHT - 300),   # Patrols on middle platform
+            ],
+            "collectibles": [
+                Collectible(100, SCREEN_HEIGHT - 70, "health_boost"),
+                Collectible(500, SCREEN_HEIGHT - 70, "score_boost"),
+            ],
+            "boss": None  # No boss in Level 1
+        }
+    if level_idx == 1:
+        # Level 2
+        return {
+            "platforms": [
+                Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40),  # Ground platform
+                Platform(100, SCREEN_HEIGHT - 120, 150, 20),
+                Platform(300, SCREEN_HEIGHT - 200, 200, 20),
+                Platform(550, SCREEN_HEIGHT - 120, 150, 20),
+                Platform(200, SCREEN_HEIGHT - 300, 100, 20),
+                Platform(400, SCREEN_HEIGHT - 400, 150, 20),
+            ],
+            "enemies": [
+                Enemy(150, SCREEN_HEIGHT - 170),
+                Enemy(400, SCREEN_HEIGHT - 250),
+                Enemy(600, SCREEN_HEIGHT - 170),
+            ],
+            "collectibles": [
+                Collectible(200, SCREEN_HEIGHT - 70, "score_boost"),
+                Collectible(600, SCREEN_HEIGHT - 70, "health_boost"),
+                Collectible(450, SCREEN_HEIGHT - 450, "extra_life"),
+            ],
+            "boss": None  # No boss in Level 2
+        }
     # Level 3 (Boss Level)
-    {
+    return {
         "platforms": [
             Platform(0, SCREEN_HEIGHT - 40, SCREEN_WIDTH, 40),  # Ground platform
             Platform(SCREEN_WIDTH / 2 - 100, SCREEN_HEIGHT - 200, 200, 20),
@@ -527,54 +692,252 @@ level_data = [
             Collectible(SCREEN_WIDTH - 100, SCREEN_HEIGHT - 70, "health_boost"),
         ],
         "boss": Enemy(SCREEN_WIDTH / 2 - 50, SCREEN_HEIGHT - 150, "boss")  # Boss fight
-    },
-]
-
-
-# Initialize the game
-def init_game():
-    global player, platforms, enemies, collectibles, score, current_level_index, game_state
-
-    player = Player(50, SCREEN_HEIGHT - 100)
-    score = 0
-    current_level_index = 0
-    load_level(current_level_index)
-    game_state = PLAYING 
-
-def load_level(level_idx):
-    global platforms, enemies, collectibles, player
-    # Initialize new empty sprite groups for platforms, enemies, and collectibles
-    platforms = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    collectibles = pygame.sprite.Group()
-
-    # Get the current level data from level_data list using the index
-    level = level_data[level_idx]
-
-    # Add all platform objects from the level to the platforms group
-    for platform_obj in level["platforms"]:
-        platforms.add(platform_obj)
-    # Add all enemy objects from the level to the enemies group
-    for enemy_obj in level["enemies"]:
-        enemies.add(enemy_obj)
-    # Add all collectible objects from the level to the collectibles group
-    for collectible_obj in level["collectibles"]:
-        collectibles.add(collectible_obj)
-    # If the level has a boss, add it to the enemies group
-    if level["boss"]:
-        enemies.add(level["boss"])  # Add boss to enemies group
-
-    # Reset player position near the bottom left of the screen
-    player.rect.x = 50
-    player.rect.y = SCREEN_HEIGHT - 100
-    # Reset player vertical velocity and jumping state
-    player.y_velocity = 0
-    player.is_jumping = False
-    
+    }
+
+
+# Headless game world: owns the player, level sprites, score and state, and advances them by one
+# fixed timestep per step() call. It never touches the display, so it can run thousands of frames
+# per second for tests, replays and training; rendering reads its state through draw_world()
+class Simulation:
+    def __init__(self):
+        self.reset()
+
+    # Start a new game from the first level
+    def reset(self):
+        self.player = Player(50, SCREEN_HEIGHT - 100)
+        self.score = 0
+        self.level_index = 0
+        self.frame = 0
+        self.load_level(self.level_index)
+        self.state = PLAYING
+
+    def load_level(self, level_idx):
+        level = build_level(level_idx)
+        # Initialize new sprite groups for platforms, enemies, and collectibles. Moving and removable
+        # sprites use RenderUpdates so a dirty-rect renderer can erase and redraw only what changed
+        self.platforms = pygame.sprite.Group(level["platforms"])
+        self.enemies = pygame.sprite.RenderUpdates(level["enemies"])
+        self.collectibles = pygame.sprite.RenderUpdates(level["collectibles"])
+        # If the level has a boss, add it to the enemies group
+        if level["boss"]:
+            self.enemies.add(level["boss"])
+
+        # Platforms and collectibles never move, so they are bucketed once here
+        self.grid = SpatialHash()
+        for platform_obj in self.platforms:
+            self.grid.insert("platforms", platform_obj)
+        for collectible_obj in self.collectibles:
+            self.grid.insert("collectibles", collectible_obj)
+        self.grid.rebuild("enemies", self.enemies)
+
+        # Reset player position near the bottom left of the screen, with no vertical velocity
+        self.player.rect.x = 50
+        self.player.rect.y = SCREEN_HEIGHT - 100
+        self.player.y_velocity = 0
+        self.player.is_jumping = False
+
+    # Leave the LEVEL_COMPLETED state by loading the level that level_index now points at
+    def continue_level(self):
+        self.load_level(self.level_index)
+        self.state = PLAYING
+
+    # Finish the current level, advancing to the next one or winning the game after the last
+    def complete_level(self):
+        self.level_index += 1
+        self.state = LEVEL_COMPLETED if self.level_index < LEVEL_COUNT else GAME_WON
+
+    # Handle the player losing a life: game over when none remain, otherwise restart the level
+    def lose_life(self):
+        if self.player.lives <= 0:
+            self.state = GAME_OVER
+        else:
+            self.load_level(self.level_index)
+
+    # Advance the world by one fixed timestep using the given FrameInput; returns the new state
+    def step(self, inputs=NO_INPUT):
+        if self.state != PLAYING:
+            return self.state
+        self.frame += 1
+        player = self.player
+
+        # One-shot actions first, then held movement, matching the order events used to arrive in
+        if inputs.jump:
+            player.jump()
+        if inputs.shoot:
+            player.shoot()
+        if inputs.left:
+            player.move(-1)
+        if inputs.right:
+            player.move(1)
+
+        # Update player and enemies with respect to platforms
+        player.update(self.grid)
+        self.enemies.update(self.grid)
+        # Enemies moved, so re-bucket them before any collision query
+        self.grid.rebuild("enemies", self.enemies)
+
+        # Check for collision between player and enemies
+        for enemy in self.grid.query("enemies", player.rect):
+            if player.invincible_timer == 0:
+                if player.take_damage(enemy.damage):
+                    self.lose_life()
+                    break
+
+        # Check player projectiles hitting enemies
+        for projectile in player.projectiles:
+            for enemy in self.grid.query("enemies", projectile.rect):
+                projectile.kill()  # Remove projectile after hit
+                if enemy.take_damage(projectile.damage):
+                    self.score += 100  # Award points for defeating the enemy
+                    enemy.kill()
+                    if enemy.enemy_type == "boss":
+                        # Boss defeated: advance to next level or win game
+                        self.complete_level()
+                        return self.state
+        if self.state != PLAYING:
+            return self.state
+
+        # Check for player collecting collectibles, removing each one on pickup
+        for collectible in self.grid.query("collectibles", player.rect):
+            collectible.kill()
+            if collectible.collectible_type == "health_boost":
+                # Increase player health, capped at max health
+                player.health = min(player.max_health, player.health + collectible.value)
+                self.score += 20
+            elif collectible.collectible_type == "extra_life":
+                player.lives += collectible.value
+                self.score += 50
+            elif collectible.collectible_type == "score_boost":
+                self.score += collectible.value
+
+        # The level is completed once no enemies (including any boss) remain
+        if not self.enemies:
+            self.complete_level()
+            return self.state
+
+        # Falling off the bottom of the screen costs a full life
+        if player.rect.top > SCREEN_HEIGHT:
+            if player.take_damage(player.max_health):
+                self.lose_life()
+
+        if player.lives <= 0:
+            self.state = GAME_OVER
+        return self.state
+
+
+# Random input policy for headless runs; seeded so a run can be replayed exactly
+def random_policy(seed=None):
+    rng = random.Random(seed)
+
+    def policy(sim):
+        return FrameInput(rng.random() < 0.3, rng.random() < 0.5, rng.random() < 0.05, rng.random() < 0.1)
+    return policy
+
+
+# Run the simulation for a number of frames without a display, starting a new game whenever one
+# ends and continuing past completed levels. Returns (frames, games, seconds)
+def run_headless(frames, policy=None, sim=None):
+    sim = sim or Simulation()
+    policy = policy or (lambda sim: NO_INPUT)
+    games = 1
+    start = time.perf_counter()
+    for _ in range(frames):
+        state = sim.step(policy(sim))
+        if state == LEVEL_COMPLETED:
+            sim.continue_level()
+        elif state in (GAME_OVER, GAME_WON):
+            sim.reset()
+            games += 1
+    return frames, games, time.perf_counter() - start
+
+
+# Draw the current simulation state: sprites, player with health bar and projectiles, and the HUD
+def draw_world(screen, sim):
+    screen.fill(BLACK)  # Clear screen
+
+    sim.platforms.draw(screen)
+    sim.collectibles.draw(screen)
+    sim.enemies.draw(screen)
+    sim.player.draw(screen)
+
+    # Display UI
+    score_text = font.render(f"Score: {sim.score}", True, WHITE)
+    health_text = font.render(f"Health: {sim.player.health}", True, WHITE)
+    lives_text = font.render(f"Lives: {sim.player.lives}", True, WHITE)
+    level_text = font.render(f"Level: {sim.level_index + 1}", True, WHITE)
+
+    screen.blit(score_text, (10, 10))
+    screen.blit(health_text, (10, 40))
+    screen.blit(lives_text, (10, 70))
+    screen.blit(level_text, (SCREEN_WIDTH - level_text.get_width() - 10, 10))
+
+
+# Dirty-rectangle renderer for the PLAYING screen. Platforms are baked once per level into a cached
+# background; each frame only the areas sprites left or now cover are restored and redrawn, and just
+# those rects are sent to display.update(). HUD text is re-rendered only when its values change
+class DirtyRenderer:
+    def __init__(self, screen):
+        self.screen = screen
+        self.background = None
+        self.platforms = None   # Platform group the background was baked from
+        self.previous = []      # Rects drawn last frame outside the sprite groups (player, health bar, HUD)
+        self.hud_values = None
+        self.hud = []           # Cached (text surface, position) pairs
+
+    # Force a full redraw on the next frame, e.g. after a menu or end screen covered the game
+    def invalidate(self):
+        self.platforms = None
+
+    def bake_background(self, platforms):
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(BLACK)
+        platforms.draw(self.background)
+        self.platforms = platforms
+
+    def hud_text(self, sim):
+        values = (sim.score, sim.player.health, sim.player.lives, sim.level_index + 1)
+        if values != self.hud_values:
+            self.hud_values = values
+            score_text = font.render(f"Score: {values[0]}", True, WHITE)
+            health_text = font.render(f"Health: {values[1]}", True, WHITE)
+            lives_text = font.render(f"Lives: {values[2]}", True, WHITE)
+            level_text = font.render(f"Level: {values[3]}", True, WHITE)
+            self.hud = [(score_text, (10, 10)), (health_text, (10, 40)), (lives_text, (10, 70)),
+                        (level_text, (SCREEN_WIDTH - level_text.get_width() - 10, 10))]
+        return self.hud
+
+    def draw(self, sim):
+        screen = self.screen
+        groups = (sim.collectibles, sim.enemies, sim.player.projectiles)
+        full_redraw = sim.platforms is not self.platforms
+        if full_redraw:
+            # New level (or first frame): rebuild the background and repaint everything
+            self.bake_background(sim.platforms)
+            screen.blit(self.background, (0, 0))
+        else:
+            # Restore the background wherever last frame's sprites, health bar and HUD were
+            for rect in self.previous:
+                screen.blit(self.background, rect, rect)
+            for group in groups:
+                group.clear(screen, self.background)
+
+        # Draw in the same order as the full renderer; RenderUpdates groups report old and new positions
+        dirty = list(self.previous)
+        dirty += sim.collectibles.draw(screen)
+        dirty += sim.enemies.draw(screen)
+        drawn = sim.player.draw(screen)  # Also draws projectiles, whose rects end up in drawn
+        for text, position in self.hud_text(sim):
+            drawn.append(screen.blit(text, position))
+        self.previous = drawn
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty + drawn)
+
 
 # Handles the quitting of the game and displays the end screen
-def show_end_screen(win_state):
-    global game_state
+def show_end_screen(sim, win_state):
     # Clear screen with black background
     SCREEN.fill(BLACK)
 
@@ -587,7 +950,7 @@ def show_end_screen(win_state):
         sub_text = font.render("Better luck next time!", True, WHITE)
     
     # Render final score and instructions to restart or quit
-    score_text = font.render(f"Final Score: {score}", True, WHITE)
+    score_text = font.render(f"Final Score: {sim.score}", True, WHITE)
     restart_text = font.render("Press 'R' to Restart", True, WHITE)
     quit_text = font.render("Press 'Q' to Quit", True, WHITE)
 
@@ -617,22 +980,20 @@ def show_end_screen(win_state):
                 if event.key == pygame.K_r:
                     # Restart game when 'R' is pressed
                     waiting_for_input = False
-                    init_game()  # Reset game variables and state
-                    game_state = PLAYING  # Set game state back to playing
+                    sim.reset()  # Reset game variables and state
                 elif event.key == pygame.K_q:
                     # Quit game when 'Q' is pressed
                     pygame.quit()
                     sys.exit()
 
 # Handles the congratulation screen after completing a level
-def show_level_completed_screen():
-    global game_state, current_level_index
+def show_level_completed_screen(sim):
     # Clear screen with black background
     SCREEN.fill(BLACK)
 
     # Render level completed message and current score
-    level_completed_text = large_font.render(f"Level {current_level_index} Completed!", True, GREEN)
-    score_text = font.render(f"Score: {score}", True, WHITE)
+    level_completed_text = large_font.render(f"Level {sim.level_index} Completed!", True, GREEN)
+    score_text = font.render(f"Score: {sim.score}", True, WHITE)
 
     # Get rectangles to center the texts
     level_completed_rect = level_completed_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
@@ -671,24 +1032,31 @@ def show_level_completed_screen():
                 if event.key == pygame.K_RETURN:
                     # Continue to next level when Enter is pressed
                     waiting_for_input = False
-                    load_level(current_level_index)
-                    game_state = PLAYING
+                    sim.continue_level()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 # Continue to next level when continue button is clicked
                 if continue_button_rect.collidepoint(event.pos):
                     waiting_for_input = False
-                    load_level(current_level_index)
-                    game_state = PLAYING
+                    sim.continue_level()
 
 
 
-def game_loop():
-    global game_state, score, current_level_index
+# render_mode "dirty" redraws only changed regions; "full" repaints the whole screen every frame
+def game_loop(render_mode="dirty"):
+    init_display()
+    game_state = MENU
+    sim = None
+    renderer = DirtyRenderer(SCREEN) if render_mode == "dirty" else None
 
     # Set up the clock to control game FPS
     clock = pygame.time.Clock()
     running = True
 
+    # Real time not yet consumed by fixed simulation steps, and one-shot presses awaiting the next step
+    accumulator = 0.0
+    pending_jump = False
+    pending_shoot = False
+
     # Define dimensions and position of the Start button on the menu screen
     start_button_width = 200
     start_button_height = 60
@@ -696,48 +1064,33 @@ def game_loop():
     start_button_y = SCREEN_HEIGHT // 2 + 180
     start_button_rect = pygame.Rect(start_button_x, start_button_y, start_button_width, start_button_height)
 
-    # Create a player instance to display on the menu screen
-    menu_player_display = Player(SCREEN_WIDTH // 2 - 20, SCREEN_HEIGHT // 2 - 80)
-    menu_player_display.draw_character(menu_player_display.image, BLUE)
-
     # Main game loop: runs while the game is running
     while running:
         # Handle all events (input, quit, etc.)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False  # Exit game loop if window is closed
-            if event.type == pygame.K_ESCAPE: 
-                running = False  # Exit game loop if Escape key pressed (Note: This condition should check event.type == pygame.KEYDOWN)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False  # Exit game loop if Escape key pressed
             
             if event.type == pygame.KEYDOWN:
                 # Handle keypresses differently depending on current game state
                 if game_state == PLAYING:
-                    if event.key == pygame.K_LEFT:
-                        pass  # Movement handled later by get_pressed()
-                    if event.key == pygame.K_RIGHT:
-                        pass
+                    # Movement is read from get_pressed() each step; jump and shoot wait for the next step
                     if event.key == pygame.K_SPACE:
-                        player.jump()  # Make the player jump
+                        pending_jump = True
                     if event.key == pygame.K_f:  # 'F' key to shoot
-                        player.shoot()
+                        pending_shoot = True
                 elif game_state == MENU:
                     if event.key == pygame.K_RETURN:  # Press Enter to start the game from menu
-                        init_game()
-                elif game_state == GAME_OVER or game_state == GAME_WON:
-                    if event.key == pygame.K_r:  # Restart game on 'R'
-                        init_game()
-                        game_state = PLAYING
-                    elif event.key == pygame.K_q:  # Quit game on 'Q'
-                        running = False
-                elif game_state == LEVEL_COMPLETED:
-                    if event.key == pygame.K_RETURN:  # Continue to next level on Enter
-                        load_level(current_level_index)
-                        game_state = PLAYING
+                        sim = Simulation()
+                        game_state = sim.state
 
             # Handle mouse click on start button in menu
             if game_state == MENU and event.type == pygame.MOUSEBUTTONDOWN:
                 if start_button_rect.collidepoint(event.pos):
-                    init_game()
+                    sim = Simulation()
+                    game_state = sim.state
 
         # Draw and update based on current game state
         if game_state == MENU:
@@ -776,137 +1129,57 @@ def game_loop():
             pygame.display.flip()
 
         elif game_state == PLAYING:
-            # Get current keyboard state for smooth continuous movement
+            # Advance the simulation in fixed steps for the real time that has passed, then draw once
             keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                player.move(-1)  # Move player left
-            if keys[pygame.K_RIGHT]:
-                player.move(1)  # Move player right
-
-            # Update player and enemies with respect to platforms
-            player.update(platforms)
-            enemies.update(platforms)
-
-            # Check for collision between player and enemies
-            for enemy in pygame.sprite.spritecollide(player, enemies, False):
-                if player.invincible_timer == 0:
-                    if player.take_damage(enemy.damage):
-                        # If player health <= 0 after damage, game over
-                        if player.lives <= 0:
-                            game_state = GAME_OVER
-                        else:
-                            # Reload current level if player still has lives
-                            load_level(current_level_index)
-                        break
-
-            # Check player projectiles hitting enemies
-            for projectile in player.projectiles:
-                hit_enemies = pygame.sprite.spritecollide(projectile, enemies, False)
-                for enemy in hit_enemies:
-                    projectile.kill()  # Remove projectile after hit
-                    if enemy.take_damage(projectile.damage):
-                        score += 100  # Award points for damaging enemy
-                        enemy.kill()  # Remove enemy if health depleted
-                        if enemy.enemy_type == "boss":
-                            # If boss defeated, advance to next level or win game
-                            current_level_index += 1
-                            if current_level_index < len(level_data):
-                                game_state = LEVEL_COMPLETED
-                            else:
-                                game_state = GAME_WON
-                            break
-                if game_state == GAME_WON or game_state == LEVEL_COMPLETED:
-                    break
-
-            # If game has ended or level completed, skip rest of loop and wait in respective screen
-            if game_state == GAME_WON or game_state == GAME_OVER or game_state == LEVEL_COMPLETED:
-                continue
-
-            # Check for player collecting collectibles
-            for collectible in pygame.sprite.spritecollide(player, collectibles, True):  # Remove collectible on pickup
-                if collectible.collectible_type == "health_boost":
-                    # Increase player health, capped at max health
-                    player.health = min(player.max_health, player.health + collectible.value)
-                    score += 20
-                elif collectible.collectible_type == "extra_life":
-                    player.lives += collectible.value  # Increase lives
-                    score += 50
-                elif collectible.collectible_type == "score_boost":
-                    score += collectible.value  # Add bonus points
-
-            # Check if level completed this frame by seeing if no enemies remain
-            level_completed_this_frame = False
-            if current_level_index < len(level_data):
-                if not enemies:
-                    # If boss exists, level completes only when boss defeated
-                    if level_data[current_level_index]["boss"] is not None:
-                        level_completed_this_frame = True
-                    else:
-                        level_completed_this_frame = True
-
-            # Handle advancing to next level or winning game after level completion
-            if level_completed_this_frame:
-                current_level_index += 1
-                if current_level_index < len(level_data):
-                    game_state = LEVEL_COMPLETED
-                else:
-                    game_state = GAME_WON
-                continue
- 
-
-
-            SCREEN.fill(BLACK) # Clear screen
-
-            platforms.draw(SCREEN)
-            collectibles.draw(SCREEN)
-            enemies.draw(SCREEN)
-            player.draw(SCREEN)
-
-
-            # Display UI
-            score_text = font.render(f"Score: {score}", True, WHITE)
-            health_text = font.render(f"Health: {player.health}", True, WHITE)
-            lives_text = font.render(f"Lives: {player.lives}", True, WHITE)
-            level_text = font.render(f"Level: {current_level_index + 1}", True, WHITE)
-
-            SCREEN.blit(score_text, (10, 10))
-            SCREEN.blit(health_text, (10, 40))
-            SCREEN.blit(lives_text, (10, 70))
-            SCREEN.blit(level_text, (SCREEN_WIDTH - level_text.get_width() - 10, 10))
-
-            pygame.display.flip()
-
-            
-            if player.rect.top > SCREEN_HEIGHT:
-                if player.take_damage(player.max_health): 
-                    if player.lives <= 0:
-                        game_state = GAME_OVER
-                    else:
-                        load_level(current_level_index) 
-                if game_state == GAME_OVER:
-                    continue
-
-            
-            if player.lives <= 0:
-                game_state = GAME_OVER
-               
-                continue 
-
-
-        elif game_state == GAME_OVER:
-            show_end_screen(GAME_OVER) 
-        elif game_state == GAME_WON:
-            show_end_screen(GAME_WON) 
+            while accumulator >= STEP_SECONDS and game_state == PLAYING:
+                inputs = FrameInput(keys[pygame.K_LEFT], keys[pygame.K_RIGHT], pending_jump, pending_shoot)
+                pending_jump = pending_shoot = False
+                game_state = sim.step(inputs)
+                accumulator -= STEP_SECONDS
+
+            if game_state == PLAYING and renderer is not None:
+                renderer.draw(sim)
+            elif game_state == PLAYING:
+                draw_world(SCREEN, sim)
+                pygame.display.flip()
+
+        elif game_state == GAME_OVER or game_state == GAME_WON:
+            show_end_screen(sim, game_state)
+            game_state = sim.state
         elif game_state == LEVEL_COMPLETED:
-            show_level_completed_screen()
-
-
-        clock.tick(60) 
+            show_level_completed_screen(sim)
+            game_state = sim.state
+
+        elapsed = clock.tick(FPS) / 1000
+        if game_state == PLAYING:
+            accumulator = min(accumulator + elapsed, MAX_FRAME_SECONDS)
+        else:
+            accumulator = STEP_SECONDS  # Step immediately when play (re)starts
+            if renderer is not None:
+                renderer.invalidate()  # Menus and end screens drew over the game
     pygame.quit()
     sys.exit()
-    
 
-if __name__ == "__main__":
-    game_loop()
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="The Jumper's Journey")
+    parser.add_argument("--headless", type=int, metavar="FRAMES",
+                        help="run this many simulation frames without a display and report the rate")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random input policy of headless runs")
+    parser.add_argument("--render", choices=("dirty", "full"), default="dirty",
+                        help="redraw only changed regions (default) or the whole screen every frame")
+    args = parser.parse_args(argv)
 
+    if args.headless is None:
+        game_loop(args.render)
+        return 0
+    sim = Simulation()
+    frames, games, seconds = run_headless(args.headless, random_policy(args.seed), sim)
+    print(f"{frames} frames, {games} game(s) in {seconds:.2f}s ({frames / seconds:.0f} frames/s)")
+    pool = sim.player.projectile_pool.stats()
+    print(f"Projectile pool (current game): {pool['hits']} hits, {pool['misses']} misses, {pool['dropped']} dropped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())